@@ -6,8 +6,14 @@ Built from Zepto.com product catalog
 
 from fastapi import FastAPI, Query, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
-import json
+from fastapi.responses import JSONResponse, Response
+import orjson
+import sqlite3
+from array import array
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from functools import lru_cache
+from math import inf, isnan, nan
 from pathlib import Path
 from typing import Optional
 import re
@@ -15,33 +21,266 @@ import re
 # Load data
 DATA_DIR = Path(__file__).parent.parent / "data" / "zepto"
 
-with open(DATA_DIR / "products_food.json") as f:
-    PRODUCTS_DATA = json.load(f)
+with open(DATA_DIR / "products_food.json", "rb") as f:
+    PRODUCTS_DATA = orjson.loads(f.read())
     PRODUCTS = PRODUCTS_DATA['products']
 
-with open(DATA_DIR / "categories.json") as f:
-    CATEGORIES = json.load(f)['categories']
+with open(DATA_DIR / "categories.json", "rb") as f:
+    CATEGORIES = orjson.loads(f.read())['categories']
 
-with open(DATA_DIR / "brands.json") as f:
-    BRANDS = json.load(f)['brands']
+with open(DATA_DIR / "brands.json", "rb") as f:
+    BRANDS = orjson.loads(f.read())['brands']
 
 # Build indices
 PRODUCTS_BY_ID = {p['product_variant_id']: p for p in PRODUCTS}
 BRANDS_BY_ID = {b['brand_id']: b for b in BRANDS}
 BRANDS_BY_SLUG = {b['brand_slug'].lower(): b for b in BRANDS}
 
+
+def _lower(text: str) -> str:
+    """Lowercase, sharing the original string when it is already lowercase"""
+    lowered = text.lower()
+    return text if lowered == text else lowered
+
+
+# Lowercased search columns, computed once so handlers only do substring scans.
+# Slugs are already lowercase, so that column costs no extra string storage.
+PRODUCT_NAMES_LOWER = tuple(_lower(p['name']) for p in PRODUCTS)
+PRODUCT_SLUGS_LOWER = tuple(_lower(p['slug']) for p in PRODUCTS)
+PRODUCT_HAS_WEIGHT = tuple(bool(p.get('weight')) for p in PRODUCTS)
+BRAND_NAMES_LOWER = tuple(_lower(b['brand_name']) for b in BRANDS)
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _build_trigram_index(*columns) -> dict:
+    """Map each trigram to the sorted row indices whose text (any column) contains it.
+
+    Postings are unsigned-int arrays: 4 bytes per entry instead of an 8-byte
+    list slot, which roughly halves the index (the largest structure after
+    the products themselves).
+    """
+    index = {}
+    for i, texts in enumerate(zip(*columns)):
+        grams = set()
+        for text in texts:
+            grams |= _trigrams(text)
+        for gram in grams:
+            postings = index.get(gram)
+            if postings is None:
+                postings = index[gram] = array('I')
+            postings.append(i)
+    return index
+
+
+# Any row containing a query as a substring contains all of its trigrams,
+# so intersecting postings gives a candidate set that is then verified exactly.
+TRIGRAM_INDEX = _build_trigram_index(PRODUCT_NAMES_LOWER, PRODUCT_SLUGS_LOWER)
+BRAND_TRIGRAM_INDEX = _build_trigram_index(BRAND_NAMES_LOWER)
+
+
+def _build_corpus(*columns):
+    """Join each row's texts into one newline-separated string, with the start offset of every row"""
+    pieces = ['\n'.join(texts) for texts in zip(*columns)]
+    starts = array('I')
+    offset = 0
+    for piece in pieces:
+        starts.append(offset)
+        offset += len(piece) + 1
+    return '\n'.join(pieces), starts
+
+
+# Terms under three characters have no trigrams; they are found with str.find
+# over all product text laid out in one string, bisecting hit offsets to rows.
+PRODUCT_CORPUS, PRODUCT_CORPUS_STARTS = _build_corpus(PRODUCT_NAMES_LOWER, PRODUCT_SLUGS_LOWER)
+
+
+def _trigram_candidates(index: dict, terms, size: int):
+    """Sorted row indices that may contain all `terms`, or range(size) if no term has a trigram"""
+    grams = set()
+    for term in terms:
+        grams |= _trigrams(term)
+    if not grams:
+        return range(size)
+    postings = sorted((index.get(g, ()) for g in grams), key=len)
+    # The rarest few postings prune almost everything; the exact check does the rest
+    return sorted(set(postings[0]).intersection(*postings[1:3]))
+
+
+def _corpus_candidates(term: str):
+    """Sorted indices of products whose name or slug may contain `term`"""
+    if '\n' in term:  # could span two rows of the corpus
+        return range(len(PRODUCTS))
+    rows = []
+    find = PRODUCT_CORPUS.find
+    last_row = len(PRODUCT_CORPUS_STARTS) - 1
+    pos = find(term)
+    while pos != -1:
+        row = bisect_right(PRODUCT_CORPUS_STARTS, pos) - 1
+        rows.append(row)
+        if len(rows) == 1000 and row < 2000:
+            # In most rows (e.g. a common letter): cheaper to check every row directly
+            return range(len(PRODUCTS))
+        if row == last_row:
+            break
+        pos = find(term, PRODUCT_CORPUS_STARTS[row + 1])
+    return rows
+
+
+def _filter_products(terms: list, has_weight: bool = False):
+    """Indices of products matching every filter, in catalog order.
+
+    `terms` is a list of (lowercased term, columns) pairs; a product matches a
+    term when it is a substring of any of the columns. Candidates come from
+    the trigram index using the trigrams of all terms together, then every
+    predicate is checked in a single pass. Terms shorter than three characters
+    contribute no trigrams; when every term is that short, candidates come
+    from a str.find scan of the product corpus for the longest one instead.
+    """
+    if not terms and not has_weight:
+        return range(len(PRODUCTS))
+    
+    if terms and all(len(term) < 3 for term, _ in terms):
+        candidates = _corpus_candidates(max((term for term, _ in terms), key=len))
+    else:
+        candidates = _trigram_candidates(TRIGRAM_INDEX, (term for term, _ in terms), len(PRODUCTS))
+    return [
+        i for i in candidates
+        if (not has_weight or PRODUCT_HAS_WEIGHT[i])
+        and all(any(term in col[i] for col in columns) for term, columns in terms)
+    ]
+
+
+@lru_cache(maxsize=256)
+def _brand_product_indices(brand_slug: str) -> array:
+    """Indices of products whose slug contains the brand slug.
+
+    get_brand only passes slugs of brands in BRANDS, and the cache keeps the
+    256 most recently requested of those as packed uint32 arrays.
+    """
+    return array('I', _filter_products([(brand_slug, (PRODUCT_SLUGS_LOWER,))]))
+
+
+# Weight strings like "500 g", "1.5 kg", "1 litre" -> grams (ml for liquids)
+_WEIGHT_RE = re.compile(r'([\d.]+)\s*(kg|g|gm|gram|ml|l|litre)')
+_UNIT_MUL = {'kg': 1000, 'g': 1, 'gm': 1, 'gram': 1, 'ml': 1, 'l': 1000, 'litre': 1000}
+
+
+def parse_weight_grams(w: Optional[str]) -> Optional[float]:
+    """Parse a weight string to grams (or ml), None if unparseable"""
+    match = _WEIGHT_RE.match(w.lower()) if w else None
+    if not match:
+        return None
+    try:
+        return float(match.group(1)) * _UNIT_MUL[match.group(2)]
+    except ValueError:  # e.g. "." or "1.2.3"
+        return None
+
+
+# Weight in grams per product as a packed float64 column, NaN when unknown
+PRODUCT_WEIGHT_GRAMS = array('d', (
+    nan if grams is None else grams
+    for grams in (parse_weight_grams(p.get('weight')) for p in PRODUCTS)
+))
+
+# Products with a known weight ordered by grams, so a weight range is two bisects
+WEIGHT_SORTED_INDICES = array('I', sorted(
+    (i for i, grams in enumerate(PRODUCT_WEIGHT_GRAMS) if not isnan(grams)),
+    key=PRODUCT_WEIGHT_GRAMS.__getitem__,
+))
+WEIGHT_SORTED_GRAMS = array('d', (PRODUCT_WEIGHT_GRAMS[i] for i in WEIGHT_SORTED_INDICES))
+
+
+def _weight_range_indices(lo: float, hi: float) -> list:
+    """Indices of products with a known weight in [lo, hi] grams, in catalog order"""
+    start = bisect_left(WEIGHT_SORTED_GRAMS, lo)
+    stop = bisect_right(WEIGHT_SORTED_GRAMS, hi)
+    return sorted(WEIGHT_SORTED_INDICES[start:stop])
+
+
 # Extract unique category slugs
-FOOD_CATEGORIES = list(set(c['category_slug'] for c in CATEGORIES if any(x in c['category_slug'].lower() for x in [
+FOOD_CATEGORY_RE = re.compile('|'.join(map(re.escape, [
     'atta', 'rice', 'oil', 'dal', 'dairy', 'bread', 'egg', 'fruit', 'vegetable',
     'masala', 'meat', 'fish', 'frozen', 'breakfast', 'snack', 'biscuit',
     'chocolate', 'sweet', 'tea', 'coffee', 'juice', 'drink', 'ice-cream', 'packaged'
 ])))
+FOOD_CATEGORIES = list(set(c['category_slug'] for c in CATEGORIES if FOOD_CATEGORY_RE.search(c['category_slug'].lower())))
+
+
+def _group_categories() -> dict:
+    """Group subcategories under their parent category"""
+    grouped = {}
+    for cat in CATEGORIES:
+        slug = cat['category_slug']
+        if slug not in grouped:
+            grouped[slug] = {
+                "category_slug": slug,
+                "category_name": cat['category_name'],
+                "category_id": cat['category_id'],
+                "subcategories": []
+            }
+        grouped[slug]['subcategories'].append({
+            "subcategory_slug": cat['subcategory_slug'],
+            "subcategory_name": cat['subcategory_name'],
+            "subcategory_id": cat['subcategory_id'],
+        })
+    
+    return {"categories": list(grouped.values())}
+
+
+# Catalog data is read-only, so these responses are serialized once
+STATS_JSON = orjson.dumps({
+    "total_products": len(PRODUCTS),
+    "total_brands": len(BRANDS),
+    "total_categories": len(CATEGORIES),
+    "food_categories": len(FOOD_CATEGORIES),
+    "products_with_weight": sum(PRODUCT_HAS_WEIGHT),
+    "source": "zepto.com",
+    "scraped_at": PRODUCTS_DATA.get('scraped_at'),
+})
+CATEGORIES_JSON = orjson.dumps(_group_categories())
+
+
+@lru_cache(maxsize=64)
+def _search_product_indices(q: Optional[str], brand: Optional[str], category: Optional[str], has_weight: bool) -> array:
+    """Matching product indices for a (lowercased) /products query.
+
+    Results are packed uint32 arrays and the cache keeps the 64 most recent
+    queries, so it holds at most 64 * 4 bytes per catalog product (about
+    6 MB for 25k products) whatever queries clients send.
+    """
+    terms = []
+    
+    # Search
+    if q:
+        terms.append((q, (PRODUCT_NAMES_LOWER, PRODUCT_SLUGS_LOWER)))
+    
+    # Brand filter
+    if brand:
+        terms.append((brand, (PRODUCT_SLUGS_LOWER,)))
+    
+    # Category filter (keyword match on slug)
+    if category:
+        terms.append((category, (PRODUCT_SLUGS_LOWER,)))
+    
+    return array('I', _filter_products(terms, has_weight=has_weight))
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson (several times faster than stdlib json)"""
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content)
+
 
 app = FastAPI(
     title="Indian Food Data API",
     description="Product catalog from Indian grocery platforms (Zepto)",
     version="0.1.0",
     docs_url="/",
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(
@@ -56,15 +295,7 @@ app.add_middleware(
 @app.get("/stats")
 def get_stats():
     """Get catalog statistics"""
-    return {
-        "total_products": len(PRODUCTS),
-        "total_brands": len(BRANDS),
-        "total_categories": len(CATEGORIES),
-        "food_categories": len(FOOD_CATEGORIES),
-        "products_with_weight": sum(1 for p in PRODUCTS if p.get('weight')),
-        "source": "zepto.com",
-        "scraped_at": PRODUCTS_DATA.get('scraped_at'),
-    }
+    return Response(content=STATS_JSON, media_type="application/json")
 
 
 @app.get("/products")
@@ -77,29 +308,15 @@ def list_products(
     offset: int = Query(0, ge=0),
 ):
     """List/search products"""
-    results = PRODUCTS
+    indices = _search_product_indices(
+        q.lower() if q else None,
+        brand.lower() if brand else None,
+        category.lower() if category else None,
+        bool(has_weight),
+    )
     
-    # Search
-    if q:
-        q_lower = q.lower()
-        results = [p for p in results if q_lower in p['name'].lower() or q_lower in p['slug'].lower()]
-    
-    # Brand filter
-    if brand:
-        brand_lower = brand.lower()
-        results = [p for p in results if brand_lower in p['slug'].lower()]
-    
-    # Category filter (keyword match on slug)
-    if category:
-        cat_lower = category.lower()
-        results = [p for p in results if cat_lower in p['slug'].lower()]
-    
-    # Weight filter
-    if has_weight:
-        results = [p for p in results if p.get('weight')]
-    
-    total = len(results)
-    results = results[offset:offset + limit]
+    total = len(indices)
+    results = [PRODUCTS[i] for i in indices[offset:offset + limit]]
     
     return {
         "total": total,
@@ -129,7 +346,8 @@ def list_brands(
     
     if q:
         q_lower = q.lower()
-        results = [b for b in results if q_lower in b['brand_name'].lower()]
+        candidates = _trigram_candidates(BRAND_TRIGRAM_INDEX, (q_lower,), len(BRANDS))
+        results = [BRANDS[i] for i in candidates if q_lower in BRAND_NAMES_LOWER[i]]
     
     total = len(results)
     results = results[offset:offset + limit]
@@ -153,36 +371,19 @@ def get_brand(brand_id: str):
         raise HTTPException(status_code=404, detail="Brand not found")
     
     # Get products for brand
-    products = [p for p in PRODUCTS if brand['brand_slug'].lower() in p['slug'].lower()][:20]
+    indices = _brand_product_indices(brand['brand_slug'].lower())
     
     return {
         **brand,
-        "product_count": len([p for p in PRODUCTS if brand['brand_slug'].lower() in p['slug'].lower()]),
-        "sample_products": products,
+        "product_count": len(indices),
+        "sample_products": [PRODUCTS[i] for i in indices[:20]],
     }
 
 
 @app.get("/categories")
 def list_categories():
     """List all food categories"""
-    # Group by category
-    grouped = {}
-    for cat in CATEGORIES:
-        slug = cat['category_slug']
-        if slug not in grouped:
-            grouped[slug] = {
-                "category_slug": slug,
-                "category_name": cat['category_name'],
-                "category_id": cat['category_id'],
-                "subcategories": []
-            }
-        grouped[slug]['subcategories'].append({
-            "subcategory_slug": cat['subcategory_slug'],
-            "subcategory_name": cat['subcategory_name'],
-            "subcategory_id": cat['subcategory_id'],
-        })
-    
-    return {"categories": list(grouped.values())}
+    return Response(content=CATEGORIES_JSON, media_type="application/json")
 
 
 @app.get("/search/advanced")
@@ -194,59 +395,144 @@ def advanced_search(
     limit: int = Query(50, ge=1, le=500),
 ):
     """Advanced search with weight parsing"""
-    results = PRODUCTS
+    terms = []
     
     if name:
-        name_lower = name.lower()
-        results = [p for p in results if name_lower in p['name'].lower()]
+        terms.append((name.lower(), (PRODUCT_NAMES_LOWER,)))
     
     if brand:
-        brand_lower = brand.lower()
-        results = [p for p in results if brand_lower in p['slug'].lower()]
+        terms.append((brand.lower(), (PRODUCT_SLUGS_LOWER,)))
     
-    # Weight filtering (parse weight strings)
+    # Weight filtering (weights are pre-parsed into PRODUCT_WEIGHT_GRAMS)
     if weight_min or weight_max:
-        def parse_weight_grams(w):
-            if not w:
-                return None
-            w = w.lower()
-            match = re.match(r'([\d.]+)\s*(kg|g|gm|gram|ml|l|litre)', w)
-            if not match:
-                return None
-            val = float(match.group(1))
-            unit = match.group(2)
-            if unit == 'kg':
-                return val * 1000
-            elif unit in ('l', 'litre'):
-                return val * 1000  # ml
-            return val
-        
-        filtered = []
-        for p in results:
-            grams = parse_weight_grams(p.get('weight'))
-            if grams is None:
-                continue
-            if weight_min and grams < weight_min:
-                continue
-            if weight_max and grams > weight_max:
-                continue
-            filtered.append({**p, 'weight_grams': grams})
-        results = filtered
+        lo = weight_min or -inf
+        hi = weight_max or inf
+        if terms:
+            # Few text matches: check them directly (unknown weights are NaN and fail both bounds)
+            indices = [i for i in _filter_products(terms) if lo <= PRODUCT_WEIGHT_GRAMS[i] <= hi]
+        else:
+            indices = _weight_range_indices(lo, hi)
+        # Only the returned page gets a copy with weight_grams added
+        results = [{**PRODUCTS[i], 'weight_grams': PRODUCT_WEIGHT_GRAMS[i]} for i in indices[:limit]]
+    else:
+        indices = _filter_products(terms)
+        results = [PRODUCTS[i] for i in indices[:limit]]
     
     return {
-        "total": len(results),
-        "results": results[:limit],
+        "total": len(indices),
+        "results": results,
     }
 
 
-# Price data storage (in-memory, can be persisted)
-PRICE_DATA = {}
-PRICE_DATA_FILE = DATA_DIR / "prices.json"
+# Price data storage (SQLite in WAL mode, safe across uvicorn workers)
+PRICE_DB_FILE = DATA_DIR / "prices.sqlite"
+PRICE_DATA_FILE = DATA_DIR / "prices.json"  # legacy store, imported on first start
+PRICE_HISTORY_LIMIT = 100
+
+# Price columns are untyped so ints and floats come back exactly as ingested
+PRICE_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS tracked_products (
+    key TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    packsize TEXT,
+    source TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS price_points (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL REFERENCES tracked_products(key),
+    seq INTEGER NOT NULL,
+    mrp,
+    selling_price,
+    discount_pct,
+    location TEXT,
+    timestamp TEXT
+);
+CREATE UNIQUE INDEX IF NOT EXISTS price_points_key_seq ON price_points(key, seq);
+CREATE INDEX IF NOT EXISTS tracked_products_name ON tracked_products(name);
+"""
 
-# Load existing price data if available
-if PRICE_DATA_FILE.exists():
-    with open(PRICE_DATA_FILE) as f:
-        PRICE_DATA = json.load(f)
+# Kept apart from PRICE_SCHEMA: _init_price_db compares it with the stored
+# trigger and only replaces that when the limit has changed
+PRICE_EVICTION_TRIGGER = f"""CREATE TRIGGER price_points_evict_oldest AFTER INSERT ON price_points
+BEGIN
+    DELETE FROM price_points WHERE key = NEW.key AND seq <= NEW.seq - {PRICE_HISTORY_LIMIT};
+END"""
+
+# `seq` numbers each product's points 1, 2, 3, ...; with the trigger above the
+# history behaves like deque(maxlen=PRICE_HISTORY_LIMIT): every insert evicts
+# at most the one point PRICE_HISTORY_LIMIT behind it through a single index probe
+INSERT_PRICE_POINT = """
+INSERT INTO price_points (key, seq, mrp, selling_price, discount_pct, location, timestamp)
+VALUES (?1, (SELECT COALESCE(MAX(seq), 0) + 1 FROM price_points WHERE key = ?1), ?2, ?3, ?4, ?5, ?6)
+"""
+
+
+@contextmanager
+def _price_db():
+    """Open a connection for one request; the block runs as a single transaction"""
+    conn = sqlite3.connect(PRICE_DB_FILE, timeout=30)
+    conn.row_factory = sqlite3.Row
+    # SQLite's own lower() and LIKE only fold ASCII, so searches use Python's
+    conn.create_function("py_lower", 1, str.lower, deterministic=True)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _import_price_json(conn: sqlite3.Connection, price_data: dict):
+    """Copy the legacy prices.json store into the database"""
+    for key, entry in price_data.items():
+        if 'price_history' in entry:
+            product = (key, entry['name'], entry.get('packsize'), entry['source'])
+            points = [
+                (key, h.get('mrp'), h.get('selling_price'), h.get('discount_pct'), h.get('location'), h.get('timestamp'))
+                for h in entry['price_history']
+            ]
+        else:
+            # Older live-price snapshots: {"history": [{"price", "mrp", ...}], "weight": ...}
+            product = (key, entry['name'], entry.get('weight'), 'zepto')
+            points = [
+                (key, h.get('mrp'), h.get('price'), None, h.get('location'), h.get('timestamp'))
+                for h in entry.get('history', [])
+            ]
+        conn.execute("INSERT OR IGNORE INTO tracked_products (key, name, packsize, source) VALUES (?, ?, ?, ?)", product)
+        conn.executemany(INSERT_PRICE_POINT, points[-PRICE_HISTORY_LIMIT:])
+
+
+def _init_price_db():
+    """Create the schema and import prices.json into an empty database.
+
+    Every uvicorn worker runs this at import, so it is one BEGIN IMMEDIATE
+    transaction: the first worker to start holds the write lock until its
+    import commits, and the others then find the database already filled.
+    """
+    conn = sqlite3.connect(PRICE_DB_FILE, timeout=30, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        try:
+            conn.executescript("BEGIN IMMEDIATE;" + PRICE_SCHEMA)
+            trigger = conn.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = 'price_points_evict_oldest'"
+            ).fetchone()
+            if trigger is None or trigger[0] != PRICE_EVICTION_TRIGGER:
+                conn.execute("DROP TRIGGER IF EXISTS price_points_evict_oldest")
+                conn.execute(PRICE_EVICTION_TRIGGER)
+            empty = conn.execute("SELECT 1 FROM tracked_products LIMIT 1").fetchone() is None
+            if empty and PRICE_DATA_FILE.exists():
+                with open(PRICE_DATA_FILE, "rb") as f:
+                    _import_price_json(conn, orjson.loads(f.read()))
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+_init_price_db()
 
 
 @app.post("/prices/ingest")
@@ -277,39 +563,23 @@ def ingest_prices(data: dict):
     location = data.get('location', 'unknown')
     timestamp = datetime.now().isoformat()
     
-    ingested = 0
+    tracked = []
+    points = []
     for p in products:
         key = f"{source}:{p.get('variant_id') or p.get('name')}"
-        
-        # Store price data with history
-        if key not in PRICE_DATA:
-            PRICE_DATA[key] = {
-                'name': p['name'],
-                'packsize': p.get('packsize'),
-                'source': source,
-                'price_history': []
-            }
-        
-        PRICE_DATA[key]['price_history'].append({
-            'mrp': p.get('mrp'),
-            'selling_price': p.get('selling_price'),
-            'discount_pct': p.get('discount_pct'),
-            'location': location,
-            'timestamp': timestamp
-        })
-        
-        # Keep only last 100 price points
-        PRICE_DATA[key]['price_history'] = PRICE_DATA[key]['price_history'][-100:]
-        ingested += 1
+        tracked.append((key, p['name'], p.get('packsize'), source))
+        points.append((key, p.get('mrp'), p.get('selling_price'), p.get('discount_pct'), location, timestamp))
     
-    # Persist to file
-    with open(PRICE_DATA_FILE, 'w') as f:
-        json.dump(PRICE_DATA, f, indent=2)
+    # One transaction; the trigger keeps only the last PRICE_HISTORY_LIMIT points per product
+    with _price_db() as conn:
+        conn.executemany("INSERT OR IGNORE INTO tracked_products (key, name, packsize, source) VALUES (?, ?, ?, ?)", tracked)
+        conn.executemany(INSERT_PRICE_POINT, points)
+        total_tracked = conn.execute("SELECT COUNT(*) FROM tracked_products").fetchone()[0]
     
     return {
         'status': 'success',
-        'ingested': ingested,
-        'total_tracked': len(PRICE_DATA),
+        'ingested': len(points),
+        'total_tracked': total_tracked,
         'timestamp': timestamp
     }
 
@@ -321,30 +591,44 @@ def get_prices(
     limit: int = Query(50, ge=1, le=500),
 ):
     """Get tracked prices with history"""
-    results = []
+    where = []
+    params = []
+    if q:
+        where.append("instr(py_lower(t.name), ?)")
+        params.append(q.lower())
+    if source:
+        where.append("instr(py_lower(t.source), ?)")
+        params.append(source.lower())
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
     
-    for key, data in PRICE_DATA.items():
-        if q and q.lower() not in data['name'].lower():
-            continue
-        if source and source.lower() not in data['source'].lower():
-            continue
-        
-        latest = data['price_history'][-1] if data['price_history'] else {}
-        results.append({
-            'key': key,
-            'name': data['name'],
-            'packsize': data.get('packsize'),
-            'source': data['source'],
-            'current_price': latest.get('selling_price'),
-            'mrp': latest.get('mrp'),
-            'discount_pct': latest.get('discount_pct'),
-            'last_updated': latest.get('timestamp'),
-            'price_points': len(data['price_history'])
-        })
+    with _price_db() as conn:
+        total = conn.execute(f"SELECT COUNT(*) FROM tracked_products t {where_sql}", params).fetchone()[0]
+        rows = conn.execute(f"""
+            SELECT t.key, t.name, t.packsize, t.source,
+                   p.selling_price, p.mrp, p.discount_pct, p.timestamp,
+                   (SELECT COUNT(*) FROM price_points WHERE key = t.key) AS price_points
+            FROM tracked_products t
+            LEFT JOIN price_points p ON p.key = t.key AND p.seq = (SELECT MAX(seq) FROM price_points WHERE key = t.key)
+            {where_sql}
+            ORDER BY t.rowid
+            LIMIT ?
+        """, [*params, limit]).fetchall()
+    
+    results = [{
+        'key': row['key'],
+        'name': row['name'],
+        'packsize': row['packsize'],
+        'source': row['source'],
+        'current_price': row['selling_price'],
+        'mrp': row['mrp'],
+        'discount_pct': row['discount_pct'],
+        'last_updated': row['timestamp'],
+        'price_points': row['price_points']
+    } for row in rows]
     
     return {
-        'total': len(results),
-        'results': results[:limit]
+        'total': total,
+        'results': results
     }
 
 
@@ -355,10 +639,21 @@ def get_price_history(key: str):
     from urllib.parse import unquote
     key = unquote(key)
     
-    if key not in PRICE_DATA:
-        raise HTTPException(status_code=404, detail="Product not tracked")
+    with _price_db() as conn:
+        product = conn.execute("SELECT name, packsize, source FROM tracked_products WHERE key = ?", (key,)).fetchone()
+        if product is None:
+            raise HTTPException(status_code=404, detail="Product not tracked")
+        history = conn.execute(
+            "SELECT mrp, selling_price, discount_pct, location, timestamp FROM price_points WHERE key = ? ORDER BY seq",
+            (key,),
+        ).fetchall()
     
-    return PRICE_DATA[key]
+    return {
+        'name': product['name'],
+        'packsize': product['packsize'],
+        'source': product['source'],
+        'price_history': [dict(h) for h in history]
+    }
 
 
 if __name__ == "__main__":
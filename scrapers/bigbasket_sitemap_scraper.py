@@ -7,11 +7,15 @@ Fetches product catalog from BigBasket's XML sitemaps
 import requests
 import re
 import json
-import xml.etree.ElementTree as ET
+from io import BytesIO
 from pathlib import Path
 from datetime import datetime
 from urllib.parse import urlparse
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from filter_food_products import build_keyword_matcher
+from sitemap_xml import iter_sitemap_elements
 
 SITEMAP_INDEX = "https://www.bigbasket.com/sitemap.xml"
 OUTPUT_DIR = Path(__file__).parent.parent / "data" / "bigbasket"
@@ -21,35 +25,44 @@ NS = {
     'sm': 'http://www.sitemaps.org/schemas/sitemap/0.9',
     'image': 'http://www.google.com/schemas/sitemap-image/1.1'
 }
+SITEMAP_TAG = f"{{{NS['sm']}}}sitemap"
+URL_TAG = f"{{{NS['sm']}}}url"
+
+# Product sitemaps fetched at once; each worker still pauses between its requests
+FETCH_WORKERS = 8
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (compatible; FoodDataBot/1.0)'
+}
 
+# Product URL format: /pd/{id}/{slug}/
+PRODUCT_URL_RE = re.compile(r'/pd/(\d+)/([^/]+)/')
+# Weight in title: "500 g", "1 kg", "250 ml", "1 L", etc.
+TITLE_WEIGHT_RE = re.compile(r'(\d+(?:\.\d+)?)\s*(g|gm|kg|ml|l|litre|ltr|pcs?|pack)\b', re.I)
 
-def fetch_sitemap(url: str) -> str:
-    """Fetch sitemap XML."""
+
+def fetch_sitemap(url: str, session: requests.Session) -> bytes:
+    """Fetch sitemap XML as raw bytes."""
     print(f"Fetching: {url}")
-    resp = requests.get(url, timeout=60, headers={
-        'User-Agent': 'Mozilla/5.0 (compatible; FoodDataBot/1.0)'
-    })
+    resp = session.get(url, timeout=60, headers=HEADERS)
     resp.raise_for_status()
-    return resp.text
+    return resp.content
 
 
-def parse_sitemap_index(xml_content: str) -> list[str]:
+def parse_sitemap_index(xml_bytes: bytes) -> list[str]:
     """Parse sitemap index to get product sitemap URLs."""
-    root = ET.fromstring(xml_content)
     sitemaps = []
-    for sitemap in root.findall('.//sm:sitemap', NS):
+    for sitemap in iter_sitemap_elements(BytesIO(xml_bytes), SITEMAP_TAG):
         loc = sitemap.find('sm:loc', NS)
         if loc is not None and 'productsitemap' in loc.text:
             sitemaps.append(loc.text)
     return sitemaps
 
 
-def parse_product_sitemap(xml_content: str) -> list[dict]:
+def parse_product_sitemap(xml_bytes: bytes) -> list[dict]:
     """Parse product sitemap and extract product info."""
-    root = ET.fromstring(xml_content)
     products = []
     
-    for url in root.findall('.//sm:url', NS):
+    for url in iter_sitemap_elements(BytesIO(xml_bytes), URL_TAG):
         loc = url.find('sm:loc', NS)
         image = url.find('.//image:image', NS)
         
@@ -60,7 +73,7 @@ def parse_product_sitemap(xml_content: str) -> list[dict]:
         
         # Extract product ID and slug from URL
         # Format: /pd/{id}/{slug}/
-        match = re.search(r'/pd/(\d+)/([^/]+)/', product_url)
+        match = PRODUCT_URL_RE.search(product_url)
         if not match:
             continue
             
@@ -81,8 +94,7 @@ def parse_product_sitemap(xml_content: str) -> list[dict]:
         # Parse weight from title
         weight = None
         if title:
-            # Patterns: "500 g", "1 kg", "250 ml", "1 L", etc.
-            weight_match = re.search(r'(\d+(?:\.\d+)?)\s*(g|gm|kg|ml|l|litre|ltr|pcs?|pack)\b', title, re.I)
+            weight_match = TITLE_WEIGHT_RE.search(title)
             if weight_match:
                 weight = f"{weight_match.group(1)} {weight_match.group(2)}"
         
@@ -106,23 +118,30 @@ def scrape_all_products():
     """Scrape all products from BigBasket sitemaps."""
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
     
+    session = requests.Session()
+    
     # Fetch sitemap index
-    index_xml = fetch_sitemap(SITEMAP_INDEX)
+    index_xml = fetch_sitemap(SITEMAP_INDEX, session)
     product_sitemaps = parse_sitemap_index(index_xml)
     
     print(f"Found {len(product_sitemaps)} product sitemaps")
     
+    def scrape_sitemap(sitemap_url: str) -> list[dict]:
+        try:
+            xml_content = fetch_sitemap(sitemap_url, session)
+            time.sleep(0.5)  # Be nice
+            return parse_product_sitemap(xml_content)
+        except Exception as e:
+            print(f"  Error with {sitemap_url}: {e}")
+            return []
+    
     all_products = []
     
-    for sitemap_url in product_sitemaps:
-        try:
-            xml_content = fetch_sitemap(sitemap_url)
-            products = parse_product_sitemap(xml_content)
+    # Fetch with bounded concurrency; map() keeps results in sitemap order
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+        for products in executor.map(scrape_sitemap, product_sitemaps):
             all_products.extend(products)
             print(f"  Extracted {len(products)} products (total: {len(all_products)})")
-            time.sleep(0.5)  # Be nice
-        except Exception as e:
-            print(f"  Error: {e}")
     
     # Save all products
     output = {
@@ -150,9 +169,10 @@ def scrape_all_products():
         'chocolate', 'sweet', 'candy', 'dry-fruit', 'nut'
     ]
     
+    is_food_slug = build_keyword_matcher(FOOD_KEYWORDS)
     food_products = [
         p for p in all_products 
-        if p.get('slug') and any(kw in p['slug'].lower() for kw in FOOD_KEYWORDS)
+        if p.get('slug') and is_food_slug(p['slug'].lower())
     ]
     
     food_output = {
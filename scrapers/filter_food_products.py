@@ -4,8 +4,14 @@ Filter Zepto products to food-only categories
 """
 
 import json
+import re
 from pathlib import Path
 
+try:
+    import ahocorasick  # pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
 DATA_DIR = Path(__file__).parent.parent / "data" / "zepto"
 
 # Food-related keywords for product filtering
@@ -99,23 +105,76 @@ EXCLUDE_KEYWORDS = [
     'iphone', 'samsung', 'case', 'cover', 'protector', 'tempered',
 ]
 
+def _trie_regex(words) -> str:
+    """
+    Build a prefix-factored alternation, e.g. ['tea', 'teff', 'toy'] ->
+    't(?:e(?:a|ff)|oy)'. The regex engine then rejects most positions after a
+    single character instead of trying every keyword in turn.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+    if not trie:
+        return '(?!)'  # never matches
+    
+    def render(node):
+        branches = [re.escape(ch) + render(child) for ch, child in sorted(node.items()) if ch]
+        if '' in node:
+            # A keyword ends here; any longer keyword is optional for a search hit
+            return ''
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+    
+    return render(trie)
+
+def build_keyword_matcher(keywords):
+    """
+    Build a function that reports whether any keyword occurs in a text.
+    
+    With pyahocorasick installed all keywords are compiled into one automaton,
+    so each text is scanned once no matter how many keywords there are.
+    Otherwise they are compiled into a single prefix-factored regex, which
+    still does the scan in C rather than one Python-level substring test per
+    keyword.
+    
+    An empty keyword occurs in every text, as with `'' in text`, and no
+    keywords at all match nothing; both backends get constant matchers for
+    these, since an automaton with no words cannot be searched.
+    """
+    keywords = set(keywords)
+    if '' in keywords:
+        return lambda text: True
+    if not keywords:
+        return lambda text: False
+    if ahocorasick is None:
+        pattern = re.compile(_trie_regex(keywords))
+        return lambda text: pattern.search(text) is not None
+    
+    automaton = ahocorasick.Automaton()
+    for kw in keywords:
+        automaton.add_word(kw, kw)
+    automaton.make_automaton()
+    return lambda text: next(automaton.iter(text), None) is not None
+
+FOOD_MATCHER = build_keyword_matcher(FOOD_KEYWORDS)
+EXCLUDE_MATCHER = build_keyword_matcher(EXCLUDE_KEYWORDS)
+
 def is_food_product(product: dict) -> bool:
     """Check if a product is food-related"""
     name = product.get('name', '').lower()
     slug = product.get('slug', '').lower()
     text = f"{name} {slug}"
     
-    # First check exclusions
-    for kw in EXCLUDE_KEYWORDS:
-        if kw in text:
-            return False
-    
-    # Then check inclusions
-    for kw in FOOD_KEYWORDS:
-        if kw in text:
-            return True
-    
-    return False
+    # First check exclusions, then inclusions. Each matcher is one C-level
+    # scan that stops at the first hit, which is cheaper than splitting the
+    # text into a word set for a whole-word lookup first.
+    if EXCLUDE_MATCHER(text):
+        return False
+    return FOOD_MATCHER(text)
 
 def main():
     # Load products
@@ -0,0 +1,22 @@
+"""
+Streaming helpers for sitemap XML, shared by the Zepto and BigBasket scrapers
+"""
+
+import xml.etree.ElementTree as ET
+from typing import BinaryIO, Iterator
+
+
+def iter_sitemap_elements(source: BinaryIO, tag: str) -> Iterator[ET.Element]:
+    """Yield each complete `tag` element of the XML read from `source`.
+
+    Yielded elements are cleared from the root afterwards, so memory stays at
+    roughly one entry however large the sitemap is; callers must finish with
+    an element before asking for the next one.
+    """
+    root = None
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if root is None:
+            root = elem
+        elif event == "end" and elem.tag == tag:
+            yield elem
+            root.clear()
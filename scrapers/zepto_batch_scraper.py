@@ -11,6 +11,8 @@ import json
 import os
 from datetime import datetime
 
+from filter_food_products import build_keyword_matcher
+
 DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) + '/data/zepto'
 
 def load_subcategories():
@@ -21,28 +23,26 @@ def load_subcategories():
 def get_scraped_categories():
     """Get list of already scraped categories from live_prices/"""
     scraped = set()
-    prices_dir = f'{DATA_DIR}/live_prices'
-    if os.path.exists(prices_dir):
-        for f in os.listdir(prices_dir):
-            if f.endswith('.json'):
+    try:
+        entries = os.scandir(f'{DATA_DIR}/live_prices')
+    except FileNotFoundError:
+        return scraped
+    with entries:
+        for entry in entries:
+            if entry.name.endswith('.json'):
                 # Extract category name from filename
-                name = f.replace('_2026-02-18.json', '').replace('_', ' ')
+                name = entry.name.replace('_2026-02-18.json', '').replace('_', ' ')
                 scraped.add(name.lower())
     return scraped
 
 def get_remaining_categories():
     """Get categories that haven't been scraped yet"""
     all_cats = load_subcategories()
-    scraped = get_scraped_categories()
-    
-    remaining = []
-    for cat in all_cats:
-        cat_key = cat['subcategory'].lower().replace(' ', '_').replace('&', '').replace('-', '_')
-        # Check various name formats
-        if not any(s in cat['subcategory'].lower() for s in scraped):
-            remaining.append(cat)
+    # Saved file names are shortened, so a category counts as scraped when
+    # any scraped name occurs in it; all names are matched in one scan
+    is_scraped = build_keyword_matcher(get_scraped_categories())
     
-    return remaining
+    return [cat for cat in all_cats if not is_scraped(cat['subcategory'].lower())]
 
 # JavaScript for category page scraping (with infinite scroll)
 CATEGORY_SCRAPE_JS = """
@@ -65,11 +65,15 @@ CATEGORY_SCRAPE_JS = """
                         // Extract products
                         const products = []; 
                         const seen = new Set(); 
+                        const RE_PVID = /pvid\\/([^/]+)/; 
+                        const RE_PRICE = /^₹(\\d+)$/; 
+                        const RE_SKIP = /OFF|ADD|Notify|mins|Premium|Sold out/i; 
+                        const RE_WEIGHT = /^(\\d+\\s*(?:pack|pc|pcs|g|ml|kg|L).*)$/i; 
                         
                         document.querySelectorAll('a[href*="/pn/"]').forEach(card => { 
                             try { 
                                 const href = card.getAttribute('href'); 
-                                const pvid = href.match(/pvid\\/([^/]+)/)?.[1]; 
+                                const pvid = href.match(RE_PVID)?.[1]; 
                                 if (!pvid || seen.has(pvid)) return; 
                                 seen.add(pvid); 
                                 
@@ -77,16 +81,20 @@ CATEGORY_SCRAPE_JS = """
                                 const lines = text.split('\\n').filter(l => l.trim()); 
                                 let price = null, mrp = null, name = '', weight = null; 
                                 
+                                // Price, MRP and name take the first match, so their
+                                // checks stop once set; weight takes the last match
                                 for (const line of lines) { 
-                                    const priceM = line.match(/^₹(\\d+)$/); 
-                                    if (priceM) { 
-                                        if (!price) price = parseInt(priceM[1]); 
-                                        else if (!mrp) mrp = parseInt(priceM[1]); 
+                                    if (!mrp) { 
+                                        const priceM = line.match(RE_PRICE); 
+                                        if (priceM) { 
+                                            if (!price) price = parseInt(priceM[1]); 
+                                            else mrp = parseInt(priceM[1]); 
+                                        } 
                                     } 
-                                    if (line.length > 3 && !line.includes('₹') && !line.match(/OFF|ADD|Notify|mins|Premium|Sold out/i)) { 
-                                        if (!name) name = line.trim(); 
+                                    if (!name && line.length > 3 && !line.includes('₹') && !RE_SKIP.test(line)) { 
+                                        name = line.trim(); 
                                     } 
-                                    const wM = line.match(/^(\\d+\\s*(?:pack|pc|pcs|g|ml|kg|L).*)$/i); 
+                                    const wM = line.match(RE_WEIGHT); 
                                     if (wM) weight = wM[1]; 
                                 } 
                                 
@@ -5,6 +5,7 @@ Uses OpenClaw browser tool to scrape live prices from Zepto
 """
 
 import json
+import orjson
 import subprocess
 import time
 from pathlib import Path
@@ -29,9 +30,20 @@ CATEGORIES = [
     ("fruits_veg", "/cn/fruits-vegetables/fruits-vegetables/cid/64374cfe-d06f-4a01-898e-c07c46462c36/scid/e78a8422-5f20-4e4b-9a9f-22a0e53962e3"),
 ]
 
-JS_EXTRACT = '''() => {
+# Waits in the page until product cards have rendered and their count has
+# settled (or 10s pass), so there is no fixed sleep after navigating
+JS_EXTRACT = '''async () => {
+    const cards = () => document.querySelectorAll('a[href*="/pn/"]');
+    const deadline = Date.now() + 10000;
+    let last = -1;
+    while (Date.now() < deadline) {
+        const count = cards().length;
+        if (count > 0 && count === last) break;
+        last = count;
+        await new Promise(resolve => setTimeout(resolve, 300));
+    }
     const products = [];
-    document.querySelectorAll('a[href*="/pn/"]').forEach(el => {
+    cards().forEach(el => {
         const text = el.textContent;
         const priceMatch = text.match(/₹(\\d+)/);
         const mrpMatch = text.match(/₹(\\d+)\\s*₹(\\d+)/);
@@ -57,7 +69,14 @@ JS_EXTRACT = '''() => {
 }'''
 
 def run_openclaw_browser(action, **kwargs):
-    """Run openclaw browser command and return result."""
+    """Run openclaw browser command and return result.
+    
+    Every call starts a new openclaw CLI process (the browser itself stays
+    up between calls), so scrape_category sticks to one navigate and one
+    evaluate per category. The CLI has no persistent/batch session mode
+    we can rely on here; if one becomes available, this is the place to
+    switch to it.
+    """
     cmd = ["openclaw", "browser", f"--browser-profile", "chrome", "--json"]
     cmd.append(action)
     for k, v in kwargs.items():
@@ -81,9 +100,7 @@ def scrape_category(name, path):
         print(f"  Failed to navigate")
         return []
     
-    time.sleep(3)  # Wait for page load
-    
-    # Extract products
+    # Extract products (the script waits for them to render)
     result = run_openclaw_browser("evaluate", fn=JS_EXTRACT)
     if not result or not result.get("ok"):
         print(f"  Failed to extract")
@@ -97,10 +114,13 @@ def scrape_category(name, path):
 def main():
     all_products = {}
     
-    for name, path in CATEGORIES:
+    # One category at a time: every call drives the same attached browser
+    # (whose session sets the store location), so categories can't overlap
+    for i, (name, path) in enumerate(CATEGORIES):
+        if i:
+            time.sleep(2)  # Be nice
         products = scrape_category(name, path)
         all_products[name] = products
-        time.sleep(2)  # Be nice
     
     # Save results
     output = {
@@ -112,8 +132,8 @@ def main():
     }
     
     output_file = OUTPUT_DIR / f"prices_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-    with open(output_file, 'w') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+    with open(output_file, 'wb') as f:
+        f.write(orjson.dumps(output, option=orjson.OPT_INDENT_2))
     
     print(f"\nSaved {output['total_products']} products to {output_file}")
     return output
@@ -7,83 +7,178 @@ No browser required!
 
 import re
 import json
+import orjson
+import sqlite3
 import subprocess
+import tempfile
+import threading
 import time
 import sys
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from functools import lru_cache
+from itertools import islice
+from typing import Iterable, Iterator, Optional
 
 # Koramangala 4th Block store ID
 STORE_ID = "9ed1ce59-1de4-4c66-8910-20fba5c55a91"
 
-def fetch_product_page(url: str, retries: int = 2) -> Optional[str]:
-    """Fetch product page HTML via curl."""
-    cmd = [
-        'curl', '-sL', url,
-        '-H', 'User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-        '-H', 'Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        '-H', f'Cookie: storeId={STORE_ID}',
-        '--compressed',
-        '--max-time', '15'
-    ]
+# Extracted results per pvid, reused by later runs until they are this old
+PAGE_CACHE_FILE = "page_cache.sqlite"
+CACHE_TTL_HOURS = 7 * 24
+
+# FSSAI format labels: "Energy (kcal) 724"
+NUTRITION_LABELS = {
+    'Energy (kcal)': 'energy_kcal',
+    'Protein (g)': 'protein_g',
+    'Carbohydrate (g)': 'carbs_g',
+    'Total Fat (g)': 'fat_g',
+    'Total Sugars (g)': 'sugar_g',
+    'Added Sugars (g)': 'added_sugar_g',
+    'Dietary Fibre (g)': 'fiber_g',
+    'Sodium (mg)': 'sodium_mg',
+    'Saturated Fat (g)': 'saturated_fat_g',
+    'Trans Fat (g)': 'trans_fat_g',
+}
+# Scan for the few unit suffixes, then check which label ends there: far
+# cheaper than trying every label alternative at every position
+NUTRITION_UNIT_RE = re.compile(r'\((g|mg|kcal)\) ([0-9.]+)')
+NUTRITION_LABELS_BY_UNIT = {}
+for label, key in NUTRITION_LABELS.items():
+    name, unit = label[:-1].split('(')
+    NUTRITION_LABELS_BY_UNIT.setdefault(unit, []).append((name, key))
+
+# Tried in order; the first pattern that matches wins
+INGREDIENTS_PATTERNS = [
+    re.compile(r'"ingredients"\s*:\s*"([^"]{10,})"'),
+    re.compile(r'"Ingredients"\s*:\s*"([^"]{10,})"'),
+]
+FSSAI_PATTERNS = [
+    re.compile(r'"fssaiLicense"\s*:\s*"([^"]+)"', re.IGNORECASE),
+    re.compile(r'"fssaiLicenseNo"\s*:\s*"([^"]+)"', re.IGNORECASE),
+    re.compile(r'FSSAI[^0-9]*([0-9]{12,14})', re.IGNORECASE),
+]
+# Every ingredients/FSSAI pattern needs one of these; decoding never creates them
+INGREDIENTS_MARKER = 'ngredients'
+FSSAI_MARKER_RE = re.compile('fssai', re.IGNORECASE)
+
+SLUG_TRANS = str.maketrans({' ': '-', '(': None, ')': None, ',': None})
+SLUG_INVALID_RE = re.compile(r'[^a-z0-9-]')
+SLUG_DASHES_RE = re.compile(r'-+')
+
+class RateLimiter:
+    """Spaces out requests to at most `rate` per second, shared across threads."""
     
-    for attempt in range(retries):
-        try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=20)
-            if result.returncode == 0 and len(result.stdout) > 10000:
-                return result.stdout
-            time.sleep(1)
-        except subprocess.TimeoutExpired:
-            print(f"  Timeout on attempt {attempt + 1}")
-            time.sleep(2)
-        except Exception as e:
-            print(f"  Error: {e}")
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self.lock = threading.Lock()
+        self.next_slot = time.monotonic()
+    
+    def wait(self, count: int = 1):
+        """Block until this caller's slot for `count` requests comes up."""
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval * count
+        time.sleep(slot - now)
+
+
+CURL_OPTIONS = [
+    '-sL',
+    '-H', 'User-Agent: Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    '-H', 'Accept: text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    '-H', f'Cookie: storeId={STORE_ID}',
+    '--compressed',
+    '--max-time', '15',
+]
+
+
+def fetch_product_pages(urls: list, parallel: int = 8, retries: int = 2) -> list:
+    """Fetch product pages with one parallel curl process, HTML (or None) per URL.
+    
+    curl -Z reads the URL/output pairs from a config file and reuses its
+    connections across them, instead of forking and handshaking once per
+    page. It reports each transfer's exit code (curl 7.75+), so a page cut off
+    by --max-time or the process timeout is discarded rather than returned
+    half-written. Pages that fail or come back too short are retried together.
+    """
+    pages = [None] * len(urls)
+    pending = list(range(len(urls)))
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_path = Path(tmp)
+        config = tmp_path / 'urls.txt'
+        for attempt in range(retries):
+            with open(config, 'w') as f:
+                for i in pending:
+                    url = urls[i].replace('\\', '\\\\').replace('"', '\\"')
+                    f.write(f'url = "{url}"\noutput = "{tmp_path / f"{i}.html"}"\n')
+            cmd = ['curl', *CURL_OPTIONS, '-Z', '--parallel-max', str(parallel),
+                   '-w', '%{exitcode} %{filename_effective}\\n', '-K', str(config)]
+            rounds = -(-len(pending) // parallel)
+            report = b''
+            try:
+                report = subprocess.run(cmd, capture_output=True, timeout=5 + 15 * rounds).stdout
+            except subprocess.TimeoutExpired as e:
+                print(f"  Timeout on attempt {attempt + 1}")
+                report = e.stdout or b''  # transfers that finished before the kill
+            except Exception as e:
+                print(f"  Error: {e}")
+            
+            # Output files of transfers that curl reported as complete
+            complete = set()
+            for line in report.decode(errors='replace').splitlines():
+                code, _, filename = line.partition(' ')
+                if code == '0':
+                    complete.add(filename)
+            
+            failed = []
+            for i in pending:
+                page = tmp_path / f"{i}.html"
+                html = page.read_text(encoding='utf-8', errors='replace') if str(page) in complete else ''
+                if len(html) > 10000:
+                    pages[i] = html
+                else:
+                    failed.append(i)
+                    page.unlink(missing_ok=True)
+            pending = failed
+            if not pending:
+                break
             time.sleep(1)
-    return None
+    return pages
+
+
+def fetch_product_page(url: str, retries: int = 2) -> Optional[str]:
+    """Fetch product page HTML via curl."""
+    return fetch_product_pages([url], parallel=1, retries=retries)[0]
+
+
+def decode_next_content(content: str) -> str:
+    """Decode Next.js escaped content (\\n, \\", \\/) in the page HTML."""
+    return content.replace('\\n', '\n').replace('\\"', '"').replace('\\/', '/')
 
 
 def extract_nutrition(content: str) -> dict:
-    """Extract nutrition data from HTML content."""
-    # Decode Next.js escaped content
-    content = content.replace('\\n', '\n').replace('\\"', '"').replace('\\/', '/')
-    
+    """Extract nutrition data from HTML content (raw or decoded, labels contain no escapes)."""
     nutrition = {}
     
-    # FSSAI format patterns: "Energy (kcal) 724"
-    patterns = [
-        (r'Energy \(kcal\) ([0-9.]+)', 'energy_kcal'),
-        (r'Protein \(g\) ([0-9.]+)', 'protein_g'),
-        (r'Carbohydrate \(g\) ([0-9.]+)', 'carbs_g'),
-        (r'Total Fat \(g\) ([0-9.]+)', 'fat_g'),
-        (r'Total Sugars \(g\) ([0-9.]+)', 'sugar_g'),
-        (r'Added Sugars \(g\) ([0-9.]+)', 'added_sugar_g'),
-        (r'Dietary Fibre \(g\) ([0-9.]+)', 'fiber_g'),
-        (r'Sodium \(mg\) ([0-9.]+)', 'sodium_mg'),
-        (r'Saturated Fat \(g\) ([0-9.]+)', 'saturated_fat_g'),
-        (r'Trans Fat \(g\) ([0-9.]+)', 'trans_fat_g'),
-    ]
-    
-    for pattern, key in patterns:
-        match = re.search(pattern, content)
-        if match:
-            nutrition[key] = float(match.group(1))
+    # One scan for all labels; the first value seen for each label wins
+    for match in NUTRITION_UNIT_RE.finditer(content):
+        start = match.start()
+        for name, key in NUTRITION_LABELS_BY_UNIT[match.group(1)]:
+            if content.endswith(name, 0, start):
+                if key not in nutrition:
+                    nutrition[key] = float(match.group(2))
+                    if len(nutrition) == len(NUTRITION_LABELS):
+                        return nutrition
+                break
     
     return nutrition
 
 
 def extract_ingredients(content: str) -> Optional[str]:
-    """Extract ingredients from HTML content."""
-    content = content.replace('\\n', '\n').replace('\\"', '"').replace('\\/', '/')
-    
-    # Try various patterns for ingredients
-    patterns = [
-        r'"ingredients"\s*:\s*"([^"]{10,})"',
-        r'"Ingredients"\s*:\s*"([^"]{10,})"',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content)
+    """Extract ingredients from decoded HTML content."""
+    for pattern in INGREDIENTS_PATTERNS:
+        match = pattern.search(content)
         if match:
             ingredients = match.group(1)
             # Clean up the ingredients text
@@ -94,17 +189,9 @@ def extract_ingredients(content: str) -> Optional[str]:
 
 
 def extract_fssai(content: str) -> Optional[str]:
-    """Extract FSSAI license number from HTML content."""
-    content = content.replace('\\n', '\n').replace('\\"', '"').replace('\\/', '/')
-    
-    patterns = [
-        r'"fssaiLicense"\s*:\s*"([^"]+)"',
-        r'"fssaiLicenseNo"\s*:\s*"([^"]+)"',
-        r'FSSAI[^0-9]*([0-9]{12,14})',
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, content, re.IGNORECASE)
+    """Extract FSSAI license number from decoded HTML content."""
+    for pattern in FSSAI_PATTERNS:
+        match = pattern.search(content)
         if match:
             return match.group(1)
     
@@ -112,14 +199,26 @@ def extract_fssai(content: str) -> Optional[str]:
 
 
 def extract_product_info(content: str, product_name: str, pvid: str) -> dict:
-    """Extract all product information from HTML."""
+    """Extract all product information from HTML.
+    
+    Zepto product pages use the Next.js app router: product data is streamed
+    as escaped React flight chunks inside script tags, not as a single
+    __NEXT_DATA__ JSON island that could be parsed once, so the fields are
+    pulled out with targeted regexes.
+    """
     nutrition = extract_nutrition(content)
-    ingredients = extract_ingredients(content)
-    fssai = extract_fssai(content)
+    
+    # Only decode the page when there is something left to look for
+    has_ingredients = INGREDIENTS_MARKER in content
+    has_fssai = FSSAI_MARKER_RE.search(content) is not None
+    decoded = decode_next_content(content) if has_ingredients or has_fssai else content
+    ingredients = extract_ingredients(decoded) if has_ingredients else None
+    fssai = extract_fssai(decoded) if has_fssai else None
     
     # Check if it's a real 404 - no nutrition data AND has 404 marker
-    has_404_marker = 'NEXT_HTTP_ERROR_FALLBACK;404' in content or 'page you\'re looking for' in content
-    is_404 = has_404_marker and len(nutrition) == 0 and not ingredients
+    # (only pages with neither nutrition nor ingredients are scanned for it)
+    is_404 = (len(nutrition) == 0 and not ingredients
+              and ('NEXT_HTTP_ERROR_FALLBACK;404' in content or 'page you\'re looking for' in content))
     
     return {
         "pvid": pvid,
@@ -133,18 +232,20 @@ def extract_product_info(content: str, product_name: str, pvid: str) -> dict:
     }
 
 
-def enrich_product(name: str, pvid: str, url: str = None) -> dict:
-    """Fetch and enrich a single product."""
-    if not url:
-        # Construct URL from pvid
-        slug = name.lower().replace(' ', '-').replace('(', '').replace(')', '').replace(',', '')
-        slug = re.sub(r'[^a-z0-9-]', '', slug)
-        slug = re.sub(r'-+', '-', slug).strip('-')
-        url = f"https://www.zeptonow.com/pn/{slug}/pvid/{pvid}"
-    
-    print(f"  Fetching: {name[:40]}...")
-    html = fetch_product_page(url)
-    
+@lru_cache(maxsize=8192)
+def product_slug(name: str) -> str:
+    """URL slug for a product name."""
+    slug = SLUG_INVALID_RE.sub('', name.lower().translate(SLUG_TRANS))
+    return SLUG_DASHES_RE.sub('-', slug).strip('-')
+
+
+def product_page_url(name: str, pvid: str) -> str:
+    """Product page URL constructed from the name and pvid."""
+    return f"https://www.zeptonow.com/pn/{product_slug(name)}/pvid/{pvid}"
+
+
+def page_result(html: Optional[str], name: str, pvid: str) -> dict:
+    """Enrichment result for a fetched page (None if the fetch failed)."""
     if not html:
         return {
             "pvid": pvid,
@@ -153,20 +254,84 @@ def enrich_product(name: str, pvid: str, url: str = None) -> dict:
             "scraped_at": datetime.now().isoformat()
         }
     
-    info = extract_product_info(html, name, pvid)
-    
-    if info['is_404']:
-        print(f"    ⚠️  404 - Product not found")
-    elif info['has_nutrition']:
-        print(f"    ✓ Nutrition: {len(info['nutrition'])} fields")
-    else:
-        print(f"    - No nutrition data")
-    
-    return info
+    return extract_product_info(html, name, pvid)
+
+
+def enrich_product(name: str, pvid: str, url: str = None) -> dict:
+    """Fetch and enrich a single product."""
+    html = fetch_product_page(url or product_page_url(name, pvid))
+    return page_result(html, name, pvid)
+
+
+def describe_result(result: dict) -> str:
+    """One-line status of an enrichment result."""
+    if result.get('error'):
+        return "✗ Fetch failed"
+    if result['is_404']:
+        return "⚠️  404 - Product not found"
+    if result['has_nutrition']:
+        return f"✓ Nutrition: {len(result['nutrition'])} fields"
+    return "- No nutrition data"
+
+
+def read_results(filename: Path) -> list:
+    """Results from a JSON-Lines results file or an older JSON results file."""
+    with open(filename, encoding='utf-8') as f:
+        if filename.suffix != '.jsonl':
+            return json.load(f).get('products', [])
+        results = []
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except ValueError:  # line cut short by an interrupted run
+                continue
+        return results
+
+
+def load_enriched_pvids(output_path: Path) -> set:
+    """pvids that earlier runs already enriched with nutrition data."""
+    pvids = set()
+    for filename in output_path.glob('nutrition_enriched_*.json*'):
+        try:
+            results = read_results(filename)
+        except (OSError, ValueError) as e:
+            print(f"  Skipping unreadable {filename}: {e}")
+            continue
+        pvids.update(r['pvid'] for r in results if r.get('has_nutrition'))
+    return pvids
+
 
+def open_page_cache(output_path: Path) -> sqlite3.Connection:
+    """Open (creating if needed) the per-pvid result cache in the output directory."""
+    conn = sqlite3.connect(output_path / PAGE_CACHE_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS results (pvid TEXT PRIMARY KEY, result TEXT NOT NULL, cached_at REAL NOT NULL)")
+    return conn
 
-def batch_enrich(products: list, output_dir: str, batch_size: int = 50, delay: float = 0.5):
-    """Enrich a batch of products."""
+
+def load_cached_results(cache: sqlite3.Connection, pvids: list, max_age_hours: float) -> dict:
+    """Cached results for `pvids` that are newer than `max_age_hours`, by pvid."""
+    placeholders = ','.join('?' * len(pvids))
+    rows = cache.execute(
+        f"SELECT pvid, result FROM results WHERE pvid IN ({placeholders}) AND cached_at >= ?",
+        [*pvids, time.time() - max_age_hours * 3600],
+    )
+    return {pvid: orjson.loads(result) for pvid, result in rows}
+
+
+def batch_enrich(products: Iterable[dict], output_dir: str, batch_size: int = 50, rps: float = 5.0, workers: int = 8,
+                 skip_enriched: bool = True, cache_ttl_hours: float = CACHE_TTL_HOURS):
+    """Enrich a batch of products.
+    
+    `products` is consumed lazily, `batch_size` products at a time, so it can
+    be a stream. Each pvid is fetched once, and with `skip_enriched` pvids
+    that already have nutrition in an earlier result file in `output_dir` are
+    skipped. Other pvids whose page was fully fetched within `cache_ttl_hours`
+    are served from the page cache (pass 0 to refetch them). Pages are fetched `workers` at a time
+    by one parallel curl process, starting at most `rps` per second; results
+    are reported and saved in input order, appended to one JSON-Lines file
+    per run that is flushed after every batch.
+    """
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
@@ -174,91 +339,176 @@ def batch_enrich(products: list, output_dir: str, batch_size: int = 50, delay: f
     success_count = 0
     error_count = 0
     
-    for i, product in enumerate(products):
-        name = product.get('name', 'Unknown')
-        pvid = product.get('pvid')
-        url = product.get('url')
-        
-        if not pvid:
-            print(f"[{i+1}/{len(products)}] Skipping {name} - no pvid")
-            continue
-        
-        print(f"[{i+1}/{len(products)}]", end="")
-        result = enrich_product(name, pvid, url)
-        results.append(result)
-        
-        if result.get('has_nutrition'):
-            success_count += 1
-        elif result.get('error') or result.get('is_404'):
-            error_count += 1
-        
-        # Save intermediate results every batch_size products
-        if (i + 1) % batch_size == 0:
-            save_results(results, output_path, f"batch_{(i+1)//batch_size}")
-        
-        time.sleep(delay)
+    done = load_enriched_pvids(output_path) if skip_enriched else set()
+    seen = set()
+    already_enriched = 0
+    cache_hits = 0
+    
+    def pending() -> Iterator[dict]:
+        nonlocal already_enriched
+        for product in products:
+            pvid = product.get('pvid')
+            if not pvid:
+                print(f"Skipping {product.get('name', 'Unknown')} - no pvid")
+                continue
+            # Same product listed under several categories: fetch it once
+            if pvid in seen:
+                continue
+            seen.add(pvid)
+            if pvid in done:
+                already_enriched += 1
+                continue
+            yield product
     
-    # Save final results
-    save_results(results, output_path, "final")
+    limiter = RateLimiter(rps)
+    
+    def fetch(batch: list) -> dict:
+        """Fresh results for the products in `batch`, by pvid."""
+        fetched = {}
+        for start in range(0, len(batch), workers):
+            chunk = batch[start:start + workers]
+            limiter.wait(len(chunk))
+            urls = [p.get('url') or product_page_url(p.get('name', 'Unknown'), p['pvid']) for p in chunk]
+            for product, html in zip(chunk, fetch_product_pages(urls, parallel=workers)):
+                fetched[product['pvid']] = page_result(html, product.get('name', 'Unknown'), product['pvid'])
+        return fetched
+    
+    queue = pending()
+    batch = list(islice(queue, batch_size))
+    if not batch:
+        print(f"Nothing to fetch ({already_enriched} already enriched)")
+        return results
+    
+    # Microseconds keep back-to-back runs (e.g. fully cached ones) in separate files
+    run_stamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    results_file = output_path / f"nutrition_enriched_{run_stamp}.jsonl"
+    cache = open_page_cache(output_path)
+    try:
+        with open(results_file, 'xb', buffering=1 << 16) as out:
+            while batch:
+                cached = load_cached_results(cache, [p['pvid'] for p in batch], cache_ttl_hours) if cache_ttl_hours > 0 else {}
+                cache_hits += len(cached)
+                fetched = fetch([p for p in batch if p['pvid'] not in cached])
+                for product in batch:
+                    result = cached.get(product['pvid']) or fetched[product['pvid']]
+                    results.append(result)
+                    out.write(orjson.dumps(result) + b'\n')
+                    from_cache = result['pvid'] in cached
+                    print(f"[{len(results)}] {result['name'][:40]}: {describe_result(result)}{' (cached)' if from_cache else ''}")
+                    # Only pages from transfers curl completed are cached; failed
+                    # or cut-off fetches come back as errors and are retried next run
+                    if not from_cache and not result.get('error'):
+                        cache.execute(
+                            "INSERT OR REPLACE INTO results (pvid, result, cached_at) VALUES (?, ?, ?)",
+                            (result['pvid'], orjson.dumps(result), time.time()),
+                        )
+                    
+                    if result.get('has_nutrition'):
+                        success_count += 1
+                    elif result.get('error') or result.get('is_404'):
+                        error_count += 1
+                
+                # Checkpoint: everything fetched so far is on disk
+                out.flush()
+                cache.commit()
+                batch = list(islice(queue, batch_size))
+    finally:
+        cache.close()
+    print(f"  Saved: {results_file}")
+    
+    save_summary({
+        "extracted_at": datetime.now().isoformat(),
+        "results_file": results_file.name,
+        "count": len(results),
+        "with_nutrition": success_count,
+        "errors": error_count,
+        "already_enriched": already_enriched,
+        "from_cache": cache_hits,
+    }, output_path / f"nutrition_summary_{run_stamp}.json")
     
     print(f"\n=== Summary ===")
-    print(f"Total: {len(products)}")
+    print(f"Total: {len(results)}")
+    print(f"Already enriched (skipped): {already_enriched}")
+    print(f"From page cache: {cache_hits}")
     print(f"With nutrition: {success_count}")
     print(f"Errors/404s: {error_count}")
-    print(f"No nutrition: {len(products) - success_count - error_count}")
+    print(f"No nutrition: {len(results) - success_count - error_count}")
     
     return results
 
 
-def save_results(results: list, output_path: Path, suffix: str):
-    """Save results to JSON file."""
-    filename = output_path / f"nutrition_enriched_{suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(filename, 'w') as f:
-        json.dump({
-            "extracted_at": datetime.now().isoformat(),
-            "count": len(results),
-            "with_nutrition": sum(1 for r in results if r.get('has_nutrition')),
-            "products": results
-        }, f, indent=2)
+def save_summary(summary: dict, filename: Path):
+    """Save run counts to a JSON file."""
+    with open(filename, 'wb') as f:
+        f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
     print(f"  Saved: {filename}")
 
 
+def load_products(path: str) -> Iterator[dict]:
+    """Products from a JSON file ({"products": [...]} or a list), or streamed from a JSON-Lines file."""
+    if path.endswith('.jsonl'):
+        def stream():
+            with open(path) as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+        return stream()
+    
+    with open(path) as f:
+        data = json.load(f)
+    
+    if isinstance(data, dict) and 'products' in data:
+        return iter(data['products'])
+    elif isinstance(data, list):
+        return iter(data)
+    else:
+        print("Error: Could not find products in input file")
+        sys.exit(1)
+
+
+def positive_float(value: str) -> float:
+    """argparse type for a float greater than zero."""
+    number = float(value)
+    if not number > 0:
+        raise ValueError(value)
+    return number
+
+
+def positive_int(value: str) -> int:
+    """argparse type for an integer greater than zero."""
+    number = int(value)
+    if number <= 0:
+        raise ValueError(value)
+    return number
+
+
 def main():
     """Main entry point."""
     import argparse
     parser = argparse.ArgumentParser(description='Zepto Nutrition Enricher (curl-based)')
-    parser.add_argument('--input', '-i', required=True, help='Input JSON file with products')
+    parser.add_argument('--input', '-i', required=True, help='Input JSON (or .jsonl, one product per line) file with products')
     parser.add_argument('--output', '-o', default='data/zepto/nutrition_curl/', help='Output directory')
     parser.add_argument('--limit', '-l', type=int, help='Limit number of products to process')
-    parser.add_argument('--delay', '-d', type=float, default=0.5, help='Delay between requests')
+    parser.add_argument('--rps', '-r', type=positive_float, default=5.0, help='Maximum page requests started per second')
+    parser.add_argument('--workers', '-w', type=positive_int, default=8, help='Concurrent page fetches per curl process')
     parser.add_argument('--test', '-t', action='store_true', help='Test mode - process first 5')
+    parser.add_argument('--refetch', action='store_true', help='Fetch every product again, ignoring earlier results and the page cache')
+    parser.add_argument('--cache-ttl', type=float, default=CACHE_TTL_HOURS, help='Hours a cached page result stays valid')
     
     args = parser.parse_args()
     
-    # Load products
-    with open(args.input) as f:
-        data = json.load(f)
-    
-    if isinstance(data, dict) and 'products' in data:
-        products = data['products']
-    elif isinstance(data, list):
-        products = data
-    else:
-        print("Error: Could not find products in input file")
-        sys.exit(1)
-    
-    # Filter to products with pvids
-    products = [p for p in products if p.get('pvid')]
-    print(f"Found {len(products)} products with pvids")
+    # Load products lazily, keeping those with pvids
+    products = (p for p in load_products(args.input) if p.get('pvid'))
     
     if args.test:
-        products = products[:5]
+        products = islice(products, 5)
         print("Test mode: processing first 5")
     elif args.limit:
-        products = products[:args.limit]
+        products = islice(products, args.limit)
         print(f"Processing first {args.limit}")
     
-    batch_enrich(products, args.output, delay=args.delay)
+    batch_enrich(products, args.output, rps=args.rps, workers=args.workers, skip_enriched=not args.refetch,
+                 cache_ttl_hours=0 if args.refetch else args.cache_ttl)
 
 
 if __name__ == '__main__':
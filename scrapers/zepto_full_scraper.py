@@ -63,10 +63,15 @@ EXTRACT_JS = """
 () => {
     const products = [];
     const seen = new Set();
+    const RE_PVID = /pvid\\/([^/]+)/;
+    const RE_PRICE = /^₹(\\d+)$/;
+    const RE_SKIP = /OFF|ADD|Notify|mins|Premium|Sold out/;
+    const RE_WEIGHT = /^(\\d+\\s*(?:pack|pc|pcs|g|ml|kg|L|pieces).*)$/i;
+    const RE_RATING = /(\\d+\\.\\d+)\\s*\\((\\d+\\.?\\d*k?)\\)/;
     document.querySelectorAll('a[href*="/pn/"]').forEach(card => {
         try {
             const href = card.getAttribute('href');
-            const pvid = href.match(/pvid\\/([^/]+)/)?.[1];
+            const pvid = href.match(RE_PVID)?.[1];
             if (seen.has(pvid)) return;
             seen.add(pvid);
             
@@ -74,18 +79,22 @@ EXTRACT_JS = """
             const lines = text.split('\\n').filter(l => l.trim());
             let price = null, mrp = null, name = '', weight = null, rating = null, reviews = null;
             
+            // Price, MRP and name take the first match, so their checks
+            // stop once set; weight and rating take the last match
             for (const line of lines) {
-                const priceM = line.match(/^₹(\\d+)$/);
-                if (priceM) {
-                    if (!price) price = parseInt(priceM[1]);
-                    else if (!mrp) mrp = parseInt(priceM[1]);
+                if (!mrp) {
+                    const priceM = line.match(RE_PRICE);
+                    if (priceM) {
+                        if (!price) price = parseInt(priceM[1]);
+                        else mrp = parseInt(priceM[1]);
+                    }
                 }
-                if (line.length > 10 && !line.includes('₹') && !line.match(/OFF|ADD|Notify|mins|Premium|Sold out/)) {
-                    if (!name) name = line.trim();
+                if (!name && line.length > 10 && !line.includes('₹') && !RE_SKIP.test(line)) {
+                    name = line.trim();
                 }
-                const wM = line.match(/^(\\d+\\s*(?:pack|pc|pcs|g|ml|kg|L|pieces).*)$/i);
+                const wM = line.match(RE_WEIGHT);
                 if (wM) weight = wM[1];
-                const rM = line.match(/(\\d+\\.\\d+)\\s*\\((\\d+\\.?\\d*k?)\\)/);
+                const rM = line.match(RE_RATING);
                 if (rM) { rating = parseFloat(rM[1]); reviews = rM[2]; }
             }
             
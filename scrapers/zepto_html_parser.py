@@ -4,13 +4,59 @@ Zepto HTML Parser
 Extracts product data from saved Zepto HTML pages (view-source format)
 """
 
+import os
 import re
-import json
+import orjson
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from html import unescape
+from itertools import chain, repeat
 from pathlib import Path
 from datetime import datetime
 
+from filter_food_products import build_keyword_matcher
+
+# Names containing none of these are not products. A tuple, since the
+# matcher is built from it once at import and wouldn't see later changes
+PRODUCT_KEYWORDS = (
+    'butter', 'spread', 'honey', 'oil', 'vinegar', 'sauce', 'jam', 'chutney', 
+    'pickle', 'jaggery', 'ketchup', 'dip', 'mayo', 'mayonnaise', 'mustard',
+    'syrup', 'muesli', 'oats', 'cereal', 'cornflakes', 'poha', 'upma',
+    'pasta', 'noodles', 'vermicelli', 'rice', 'dal', 'lentil', 'beans',
+    'chocolate', 'cocoa', 'coffee', 'tea', 'milk', 'cream', 'cheese',
+    'paneer', 'tofu', 'yogurt', 'curd', 'lassi', 'buttermilk',
+    'bread', 'roti', 'naan', 'paratha', 'biscuit', 'cookie',
+    'chips', 'namkeen', 'snack', 'nuts', 'seeds', 'dried',
+    'juice', 'drink', 'water', 'soda', 'energy',
+    'masala', 'spice', 'salt', 'sugar', 'flour', 'atta',
+    'ghee', 'cooking', 'olive', 'coconut', 'sunflower',
+    'protein', 'whey', 'supplement', 'vitamin',
+    'organic', 'natural', 'fresh', 'pure'
+)
+PRODUCT_MATCHER = build_keyword_matcher(PRODUCT_KEYWORDS)
+
+# Every field in one pass, dispatched on the group that matched. Only the
+# opening of a field is consumed (closing quotes and the productVariant body
+# are lookaheads), so fields nested inside others are still found.
+# Runs on the page with its JSON escapes still encoded: any quote after the
+# opening one may be an escaped \" (a value never starts with one, and stops
+# short of the one that closes it), an escaped \n may stand in for
+# whitespace, and name lengths are checked once decoded
+FIELDS_RE = re.compile(
+    r'"name\\?"(?:\s|\\n)*:(?:\s|\\n)*\\?"(?P<name>(?!\\")[^"]+?)(?=\\?")'
+    r'|"formattedPacksize\\?"(?:\s|\\n)*:(?:\s|\\n)*\\?"(?P<packsize>(?!\\")[^"]+?)(?=\\?")'
+    r'|"productVariant\\?"(?:\s|\\n)*:(?:\s|\\n)*'
+    r'(?=\{[^}]*"id\\?"(?:\s|\\n)*:(?:\s|\\n)*\\?"(?P<variant_id>(?!\\")[^"]+?)\\?")'
+    r'|"mrp\\?"(?:\s|\\n)*:(?:\s|\\n)*(?P<mrp>\d+)'
+    r'|"sellingPrice\\?"(?:\s|\\n)*:(?:\s|\\n)*(?P<selling_price>\d+)'
+)
+TEXT_FIELDS = frozenset(('name', 'packsize', 'variant_id'))
+
+# HTML entities that can stand for JSON structure (quotes, backslashes).
+# View-source pages encode the embedded JSON this way; elsewhere entities
+# only occur inside string values
+ENCODED_JSON_RE = re.compile(r'&(?:#|quot|QUOT|bsol)')
+
 def parse_zepto_html(file_path: str) -> list[dict]:
     """
     Parse a saved Zepto HTML page and extract product data.
@@ -22,10 +68,13 @@ def parse_zepto_html(file_path: str) -> list[dict]:
         List of product dictionaries with name, packsize, mrp, selling_price, discount_pct
     """
     with open(file_path, 'r', encoding='utf-8') as f:
-        content = unescape(f.read())
+        content = f.read()
     
-    # Clean up escaped JSON
-    content = content.replace('\\"', '"').replace('\\n', '\n').replace('\\/', '/')
+    # Unescape the whole page only if its JSON is entity-encoded; otherwise
+    # just the extracted text fields are unescaped, sparing a full-page copy
+    unescape_page = ENCODED_JSON_RE.search(content) is not None
+    if unescape_page:
+        content = unescape(content)
     
     # Extract fields in order
     names = []
@@ -34,63 +83,78 @@ def parse_zepto_html(file_path: str) -> list[dict]:
     packsizes = []
     variant_ids = []
     
-    # Product names - filter to actual products
-    PRODUCT_KEYWORDS = [
-        'butter', 'spread', 'honey', 'oil', 'vinegar', 'sauce', 'jam', 'chutney', 
-        'pickle', 'jaggery', 'ketchup', 'dip', 'mayo', 'mayonnaise', 'mustard',
-        'syrup', 'muesli', 'oats', 'cereal', 'cornflakes', 'poha', 'upma',
-        'pasta', 'noodles', 'vermicelli', 'rice', 'dal', 'lentil', 'beans',
-        'chocolate', 'cocoa', 'coffee', 'tea', 'milk', 'cream', 'cheese',
-        'paneer', 'tofu', 'yogurt', 'curd', 'lassi', 'buttermilk',
-        'bread', 'roti', 'naan', 'paratha', 'biscuit', 'cookie',
-        'chips', 'namkeen', 'snack', 'nuts', 'seeds', 'dried',
-        'juice', 'drink', 'water', 'soda', 'energy',
-        'masala', 'spice', 'salt', 'sugar', 'flour', 'atta',
-        'ghee', 'cooking', 'olive', 'coconut', 'sunflower',
-        'protein', 'whey', 'supplement', 'vitamin',
-        'organic', 'natural', 'fresh', 'pure'
-    ]
-    
-    for match in re.finditer(r'"name"\s*:\s*"([^"]{10,200})"', content):
-        name = match.group(1)
-        if any(kw in name.lower() for kw in PRODUCT_KEYWORDS):
-            names.append(name)
-    
-    # Packsizes
-    for match in re.finditer(r'"formattedPacksize"\s*:\s*"([^"]+)"', content):
-        packsizes.append(match.group(1))
-    
-    # Variant IDs (for deduplication/matching)
-    for match in re.finditer(r'"productVariant"\s*:\s*\{[^}]*"id"\s*:\s*"([^"]+)"', content):
-        variant_ids.append(match.group(1))
-    
-    # Prices - MRP appears twice per product, so we dedupe
-    mrp_raw = [int(m.group(1)) for m in re.finditer(r'"mrp"\s*:\s*(\d+)', content)]
-    mrps = mrp_raw[::2]  # Every other one
-    
-    selling_prices = [int(m.group(1)) for m in re.finditer(r'"sellingPrice"\s*:\s*(\d+)', content)]
-    
-    # Build products from available data
-    min_len = min(len(names), len(mrps), len(selling_prices), len(packsizes))
-    
+    # Prices - MRP appears twice per product, so only every other one is kept
+    take_mrp = True
+    
+    # One iteration per field on the page: text values are only decoded when
+    # they contain something to decode
+    for match in FIELDS_RE.finditer(content):
+        field = match.lastgroup
+        value = match[field]
+        if field in TEXT_FIELDS:
+            if not unescape_page and '&' in value:
+                value = unescape(value)
+            if '\\' in value:
+                value = value.replace('\\n', '\n').replace('\\/', '/')
+        if field == 'name':
+            # Product names - filter to actual products
+            if 10 <= len(value) <= 200 and PRODUCT_MATCHER(value.lower()):
+                names.append(value)
+        elif field == 'packsize':
+            packsizes.append(value)
+        elif field == 'variant_id':
+            # Variant IDs (for deduplication/matching)
+            variant_ids.append(value)
+        elif field == 'mrp':
+            if take_mrp:
+                mrps.append(int(value))
+            take_mrp = not take_mrp
+        else:
+            selling_prices.append(int(value))
+    
+    # Build products from available data (zip stops at the shortest field
+    # list; products past the last variant ID get None). The price math is a
+    # few float ops per product, a small fraction of the page scan above
     products = []
-    for i in range(min_len):
-        mrp = mrps[i] / 100  # Convert from paise
-        selling = selling_prices[i] / 100
+    for name, packsize, mrp_paise, selling_paise, variant_id in zip(
+            names, packsizes, mrps, selling_prices, chain(variant_ids, repeat(None))):
+        mrp = mrp_paise / 100  # Convert from paise
+        selling = selling_paise / 100
         discount = round((1 - selling/mrp) * 100) if mrp > 0 else 0
         
         products.append({
-            'name': names[i],
-            'packsize': packsizes[i],
+            'name': name,
+            'packsize': packsize,
             'mrp': mrp,
             'selling_price': selling,
             'discount_pct': discount,
-            'variant_id': variant_ids[i] if i < len(variant_ids) else None
+            'variant_id': variant_id
         })
     
     return products
 
 
+def parse_many(file_paths: list[str], workers: int = None) -> list[list[dict]]:
+    """
+    Parse several saved Zepto HTML pages in parallel worker processes.
+    
+    Args:
+        file_paths: Paths to the saved HTML files
+        workers: Number of processes (default: one per CPU)
+        
+    Returns:
+        One product list per file, in the order of file_paths
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(file_paths) < 2:
+        return [parse_zepto_html(path) for path in file_paths]
+    
+    # Parsing is CPU-bound regex work, so threads would just contend for the GIL
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunksize = max(1, len(file_paths) // (4 * workers))
+        return list(executor.map(parse_zepto_html, file_paths, chunksize=chunksize))
+
+
 def save_products(products: list[dict], output_path: str):
     """Save products to JSON file with metadata."""
     data = {
@@ -100,8 +164,8 @@ def save_products(products: list[dict], output_path: str):
         'products': products
     }
     
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    with open(output_path, 'wb') as f:
+        f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
     
     print(f"Saved {len(products)} products to {output_path}")
 
@@ -6,7 +6,7 @@ Setup: playwright install chromium
 """
 
 import asyncio
-import json
+import orjson
 import re
 from datetime import datetime
 from pathlib import Path
@@ -141,8 +141,8 @@ def main():
             }
             
             output_file = OUTPUT_DIR / f"prices_{datetime.now().strftime('%Y%m%d_%H%M')}.json"
-            with open(output_file, "w") as f:
-                json.dump(results, f, indent=2)
+            with open(output_file, "wb") as f:
+                f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
             
             print(f"Saved to {output_file}")
             print(f"API responses captured: {len(api_responses)}")
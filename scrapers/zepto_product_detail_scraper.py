@@ -7,6 +7,8 @@ Usage: This is designed to be called from browser automation.
 The JS extraction function can be used directly in browser.act(evaluate).
 """
 
+import re
+
 # JavaScript extraction function for browser.act(evaluate)
 EXTRACTION_JS = """
 () => {
@@ -16,19 +18,24 @@ EXTRACTION_JS = """
     product.name = document.querySelector('h1')?.innerText?.trim();
     product.url = window.location.href;
     
+    // innerText forces a layout, so read it once
+    const text = document.body.innerText;
+    
     // Price
-    const priceEl = document.body.innerText.match(/₹\\s*(\\d+)\\s*MRP/);
+    const priceEl = text.match(/₹\\s*(\\d+)\\s*MRP/);
     product.price = priceEl ? parseInt(priceEl[1]) : null;
-    const mrpEl = document.body.innerText.match(/MRP\\s*₹\\s*(\\d+)/);
+    const mrpEl = text.match(/MRP\\s*₹\\s*(\\d+)/);
     product.mrp = mrpEl ? parseInt(mrpEl[1]) : null;
     
     // Weight
-    const weightMatch = document.body.innerText.match(/Net Qty:\\s*([^•]+)/);
+    const weightMatch = text.match(/Net Qty:\\s*([^•]+)/);
     product.weight = weightMatch ? weightMatch[1].trim() : null;
     
-    // Nutrition (standard FSSAI format)
-    const text = document.body.innerText;
-    const nutritionMatch = text.match(/Energy \\(kcal\\) ([\\d.]+).*?Protein \\(g\\) ([\\d.]+).*?Carbohydrate \\(g\\) ([\\d.]+).*?Total Sugars \\(g\\) ([\\d.]+).*?Added Sugars \\(g\\) ([\\d.]+).*?Dietary Fibre \\(g\\) ([\\d.]+).*?Total Fat \\(g\\) ([\\d.]+).*?Saturated Fat \\(g\\) ([\\d.]+).*?Trans Fat \\(g\\) ([\\d.]+).*?Sodium \\(mg\\) ([\\d.]+)/);
+    // Nutrition (standard FSSAI format). The panel can only start at the
+    // first "Energy (kcal) ", so the lazy .*? chain never runs over the
+    // text before it, nor at all on pages without one
+    const energyIdx = text.indexOf('Energy (kcal) ');
+    const nutritionMatch = energyIdx < 0 ? null : text.slice(energyIdx).match(/Energy \\(kcal\\) ([\\d.]+).*?Protein \\(g\\) ([\\d.]+).*?Carbohydrate \\(g\\) ([\\d.]+).*?Total Sugars \\(g\\) ([\\d.]+).*?Added Sugars \\(g\\) ([\\d.]+).*?Dietary Fibre \\(g\\) ([\\d.]+).*?Total Fat \\(g\\) ([\\d.]+).*?Saturated Fat \\(g\\) ([\\d.]+).*?Trans Fat \\(g\\) ([\\d.]+).*?Sodium \\(mg\\) ([\\d.]+)/);
     
     if (nutritionMatch) {
         product.nutrition = {
@@ -72,6 +79,9 @@ EXTRACTION_JS = """
 }
 """
 
+WEIGHT_KG_RE = re.compile(r'([\d.]+)\s*kg')
+WEIGHT_G_RE = re.compile(r'([\d.]+)\s*g')
+
 # Computed nutrition metrics
 def compute_nutrition_metrics(product: dict) -> dict:
     """Add computed nutrition metrics for analysis"""
@@ -83,26 +93,30 @@ def compute_nutrition_metrics(product: dict) -> dict:
     price = product['price']
     
     # Parse weight to grams
-    weight_str = product.get('weight', '')
+    weight_str = (product.get('weight') or '').lower()
     weight_g = None
-    if 'kg' in weight_str.lower():
-        match = re.search(r'([\d.]+)\s*kg', weight_str.lower())
+    if 'kg' in weight_str:
+        match = WEIGHT_KG_RE.search(weight_str)
         if match:
             weight_g = float(match.group(1)) * 1000
-    elif 'g' in weight_str.lower():
-        match = re.search(r'([\d.]+)\s*g', weight_str.lower())
+    elif 'g' in weight_str:
+        match = WEIGHT_G_RE.search(weight_str)
         if match:
             weight_g = float(match.group(1))
     
     if weight_g and weight_g > 0:
         # Per 100g values (nutrition is usually per 100g)
+        protein = nutrition['protein_g']
+        energy = nutrition['energy_kcal']
+        fiber = nutrition['fiber_g']
+        
         # Price efficiency metrics
         product['metrics'] = {
             'price_per_100g': round(price / weight_g * 100, 2),
-            'price_per_10g_protein': round(price / (nutrition['protein_g'] * weight_g / 100) * 10, 2) if nutrition['protein_g'] > 0 else None,
-            'price_per_1000kcal': round(price / (nutrition['energy_kcal'] * weight_g / 100) * 1000, 2) if nutrition['energy_kcal'] > 0 else None,
-            'protein_density': round(nutrition['protein_g'] / nutrition['energy_kcal'] * 100, 2) if nutrition['energy_kcal'] > 0 else None,
-            'sugar_to_fiber_ratio': round(nutrition['sugar_g'] / nutrition['fiber_g'], 2) if nutrition['fiber_g'] > 0 else None,
+            'price_per_10g_protein': round(price / (protein * weight_g / 100) * 10, 2) if protein > 0 else None,
+            'price_per_1000kcal': round(price / (energy * weight_g / 100) * 1000, 2) if energy > 0 else None,
+            'protein_density': round(protein / energy * 100, 2) if energy > 0 else None,
+            'sugar_to_fiber_ratio': round(nutrition['sugar_g'] / fiber, 2) if fiber > 0 else None,
         }
     
     return product
@@ -136,6 +150,10 @@ def flag_ingredients(ingredients: str) -> list:
     ingredients_lower = ingredients.lower()
     flags = []
     
+    # Plain substring tests: on ingredient-list-sized strings these 16 C-level
+    # scans beat one combined regex, which has to try every alternative at
+    # every position, and an Aho-Corasick automaton, which hands back a
+    # Python tuple for every match
     for pattern, flag_type in RED_FLAG_INGREDIENTS:
         if pattern in ingredients_lower:
             flags.append({'ingredient': pattern, 'flag': flag_type})
@@ -144,8 +162,6 @@ def flag_ingredients(ingredients: str) -> list:
 
 
 if __name__ == '__main__':
-    import re
-    
     # Example usage
     sample = {
         'name': "Lay's Magic Masala",
@@ -6,14 +6,16 @@ Extracts product catalog from sitemaps for Indian Food Data API
 
 import requests
 import xml.etree.ElementTree as ET
-import json
+import orjson
 import re
-import time
 from datetime import datetime
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator
 from urllib.parse import urlparse, unquote
 
+from sitemap_xml import iter_sitemap_elements
+
 # Config
 BASE_URL = "https://www.zepto.com"
 SITEMAP_PRODUCTS = f"{BASE_URL}/sitemap/products.xml"
@@ -24,24 +26,48 @@ HEADERS = {
     "User-Agent": "Mozilla/5.0 (compatible; FoodDataAPI/1.0; +https://github.com/travellingsaasman)",
     "Accept": "application/xml,text/xml,*/*"
 }
+NS = {
+    "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
+    "image": "http://www.google.com/schemas/sitemap-image/1.1"
+}
+# Qualified tags, so lookups match tags directly instead of going through
+# XPath and the namespace map
+URL_TAG = f"{{{NS['sm']}}}url"
+LOC_TAG = f"{{{NS['sm']}}}loc"
+LASTMOD_TAG = f"{{{NS['sm']}}}lastmod"
+IMAGE_LOC_TAG = f"{{{NS['image']}}}loc"
+IMAGE_TITLE_TAG = f"{{{NS['image']}}}title"
+
+# Sitemap URLs are absolute with the path right after the host, so the
+# patterns are anchored there instead of searching with a leading .*
+PRODUCT_URL_RE = re.compile(r"https?://[^/]+/pn/([^/]+)/pvid/([a-f0-9-]+)")
+CATEGORY_URL_RE = re.compile(r"https?://[^/]+/cn/([^/]+)/([^/]+)/cid/([a-f0-9-]+)/scid/([a-f0-9-]+)")
+BRAND_URL_RE = re.compile(r"https?://[^/]+/brand/([^/]+)/([a-f0-9-]+)")
+WEIGHT_RE = re.compile(r"(\d+(?:\.\d+)?)\s*(kg|g|ml|l|litre|liter|gm|gram|pack|piece|pc|count|unit)", re.I)
 
-def fetch_xml(url: str) -> ET.Element:
+def fetch_xml(url: str, session: requests.Session) -> ET.Element:
     """Fetch and parse XML from URL"""
-    resp = requests.get(url, headers=HEADERS, timeout=30)
+    resp = session.get(url, headers=HEADERS, timeout=30)
     resp.raise_for_status()
     return ET.fromstring(resp.content)
 
-def parse_sitemap_index(url: str) -> list[str]:
+def iter_sitemap_urls(url: str, session: requests.Session) -> Iterator[ET.Element]:
+    """Download a sitemap and parse its <url> entries while the body streams in."""
+    with session.get(url, headers=HEADERS, timeout=30, stream=True) as resp:
+        resp.raise_for_status()
+        resp.raw.decode_content = True  # Undo any gzip/deflate encoding
+        yield from iter_sitemap_elements(resp.raw, URL_TAG)
+
+def parse_sitemap_index(url: str, session: requests.Session) -> list[str]:
     """Parse sitemap index and return list of sitemap URLs"""
-    root = fetch_xml(url)
-    ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
-    return [loc.text for loc in root.findall(".//sm:loc", ns)]
+    root = fetch_xml(url, session)
+    return [loc.text for loc in root.iter(LOC_TAG)]
 
 def parse_product_url(url: str) -> dict:
     """Extract product info from URL pattern:
     https://www.zepto.com/pn/{slug}/pvid/{product_variant_id}
     """
-    match = re.match(r".*/pn/([^/]+)/pvid/([a-f0-9-]+)", url)
+    match = PRODUCT_URL_RE.match(url)
     if not match:
         return None
     
@@ -49,16 +75,15 @@ def parse_product_url(url: str) -> dict:
     pvid = match.group(2)
     
     # Parse slug to extract product name and possible attributes
-    name_parts = slug.replace("-", " ").split()
+    spaced = slug.replace("-", " ")
     
     # Try to extract weight/quantity patterns
-    weight_pattern = r"(\d+(?:\.\d+)?)\s*(kg|g|ml|l|litre|liter|gm|gram|pack|piece|pc|count|unit)"
-    weight_match = re.search(weight_pattern, slug.replace("-", " "), re.I)
+    weight_match = WEIGHT_RE.search(spaced)
     
     return {
         "product_variant_id": pvid,
         "slug": slug,
-        "name": unquote(slug.replace("-", " ")).title(),
+        "name": unquote(spaced).title(),
         "url": url,
         "weight": weight_match.group(0) if weight_match else None
     }
@@ -67,7 +92,7 @@ def parse_category_url(url: str) -> dict:
     """Extract category info from URL pattern:
     https://www.zepto.com/cn/{category}/{subcategory}/cid/{cat_id}/scid/{subcat_id}
     """
-    match = re.match(r".*/cn/([^/]+)/([^/]+)/cid/([a-f0-9-]+)/scid/([a-f0-9-]+)", url)
+    match = CATEGORY_URL_RE.match(url)
     if not match:
         return None
     
@@ -85,7 +110,7 @@ def parse_brand_url(url: str) -> dict:
     """Extract brand info from URL pattern:
     https://www.zepto.com/brand/{brand_name}/{brand_id}
     """
-    match = re.match(r".*/brand/([^/]+)/([a-f0-9-]+)", url)
+    match = BRAND_URL_RE.match(url)
     if not match:
         return None
     
@@ -96,18 +121,12 @@ def parse_brand_url(url: str) -> dict:
         "url": url
     }
 
-def scrape_products_sitemap(sitemap_url: str) -> list[dict]:
+def scrape_products_sitemap(sitemap_url: str, session: requests.Session) -> list[dict]:
     """Scrape a single products sitemap"""
     products = []
     try:
-        root = fetch_xml(sitemap_url)
-        ns = {
-            "sm": "http://www.sitemaps.org/schemas/sitemap/0.9",
-            "image": "http://www.google.com/schemas/sitemap-image/1.1"
-        }
-        
-        for url_elem in root.findall(".//sm:url", ns):
-            loc = url_elem.find("sm:loc", ns)
+        for url_elem in iter_sitemap_urls(sitemap_url, session):
+            loc = url_elem.find(LOC_TAG)
             if loc is None:
                 continue
             
@@ -116,15 +135,15 @@ def scrape_products_sitemap(sitemap_url: str) -> list[dict]:
                 continue
             
             # Get image
-            img_loc = url_elem.find(".//image:loc", ns)
-            img_title = url_elem.find(".//image:title", ns)
+            img_loc = next(url_elem.iter(IMAGE_LOC_TAG), None)
+            img_title = next(url_elem.iter(IMAGE_TITLE_TAG), None)
             if img_loc is not None:
                 product["image_url"] = img_loc.text
             if img_title is not None:
                 product["image_title"] = img_title.text
             
             # Get lastmod
-            lastmod = url_elem.find("sm:lastmod", ns)
+            lastmod = url_elem.find(LASTMOD_TAG)
             if lastmod is not None:
                 product["last_modified"] = lastmod.text
             
@@ -134,14 +153,13 @@ def scrape_products_sitemap(sitemap_url: str) -> list[dict]:
     
     return products
 
-def scrape_categories() -> list[dict]:
+def scrape_categories(session: requests.Session) -> list[dict]:
     """Scrape all categories from sitemap"""
     categories = []
     try:
-        root = fetch_xml(SITEMAP_CATEGORIES)
-        ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+        root = fetch_xml(SITEMAP_CATEGORIES, session)
         
-        for loc in root.findall(".//sm:loc", ns):
+        for loc in root.iter(LOC_TAG):
             cat = parse_category_url(loc.text)
             if cat:
                 categories.append(cat)
@@ -150,14 +168,13 @@ def scrape_categories() -> list[dict]:
     
     return categories
 
-def scrape_brands() -> list[dict]:
+def scrape_brands(session: requests.Session) -> list[dict]:
     """Scrape all brands from sitemap"""
     brands = []
     try:
-        root = fetch_xml(SITEMAP_BRANDS)
-        ns = {"sm": "http://www.sitemaps.org/schemas/sitemap/0.9"}
+        root = fetch_xml(SITEMAP_BRANDS, session)
         
-        for loc in root.findall(".//sm:loc", ns):
+        for loc in root.iter(LOC_TAG):
             brand = parse_brand_url(loc.text)
             if brand:
                 brands.append(brand)
@@ -172,31 +189,37 @@ def main():
     
     print(f"[{datetime.now()}] Starting Zepto scraper...")
     
+    # One session for every request, so connections to the sitemap host are
+    # kept alive and reused across sitemaps and worker threads
+    session = requests.Session()
+    
     # 1. Scrape categories
     print("Scraping categories...")
-    categories = scrape_categories()
-    with open(OUTPUT_DIR / "categories.json", "w") as f:
-        json.dump({"count": len(categories), "categories": categories}, f, indent=2)
+    categories = scrape_categories(session)
+    with open(OUTPUT_DIR / "categories.json", "wb") as f:
+        f.write(orjson.dumps({"count": len(categories), "categories": categories}, option=orjson.OPT_INDENT_2))
     print(f"  → {len(categories)} categories")
     
     # 2. Scrape brands
     print("Scraping brands...")
-    brands = scrape_brands()
-    with open(OUTPUT_DIR / "brands.json", "w") as f:
-        json.dump({"count": len(brands), "brands": brands}, f, indent=2)
+    brands = scrape_brands(session)
+    with open(OUTPUT_DIR / "brands.json", "wb") as f:
+        f.write(orjson.dumps({"count": len(brands), "brands": brands}, option=orjson.OPT_INDENT_2))
     print(f"  → {len(brands)} brands")
     
     # 3. Get list of product sitemaps
     print("Getting product sitemap index...")
-    product_sitemaps = parse_sitemap_index(SITEMAP_PRODUCTS)
+    product_sitemaps = parse_sitemap_index(SITEMAP_PRODUCTS, session)
     print(f"  → {len(product_sitemaps)} product sitemaps")
     
     # 4. Scrape all product sitemaps (parallel)
     print("Scraping products (parallel)...")
     all_products = []
     
+    # At most 5 sitemaps are in flight at once, which is what limits the
+    # request rate; results are reported as soon as each one completes
     with ThreadPoolExecutor(max_workers=5) as executor:
-        futures = {executor.submit(scrape_products_sitemap, url): url for url in product_sitemaps}
+        futures = {executor.submit(scrape_products_sitemap, url, session): url for url in product_sitemaps}
         for i, future in enumerate(as_completed(futures)):
             url = futures[future]
             try:
@@ -205,15 +228,14 @@ def main():
                 print(f"  → [{i+1}/{len(product_sitemaps)}] {len(products)} products from {url.split('/')[-1]}")
             except Exception as e:
                 print(f"  → Error with {url}: {e}")
-            time.sleep(0.5)  # Rate limiting
     
     # 5. Save products
-    with open(OUTPUT_DIR / "products.json", "w") as f:
-        json.dump({
+    with open(OUTPUT_DIR / "products.json", "wb") as f:
+        f.write(orjson.dumps({
             "count": len(all_products),
             "scraped_at": datetime.now().isoformat(),
             "products": all_products
-        }, f, indent=2)
+        }, option=orjson.OPT_INDENT_2))
     
     # 6. Summary
     print(f"\n[{datetime.now()}] Scraping complete!")
@@ -0,0 +1,77 @@
+import functools
+import http.server
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scrapers"))
+
+import zepto_curl_enricher
+
+PAGE = b'<html>' + b' ' * 12000 + b'Energy (kcal) 120 Protein (g) 3.5</html>'
+
+
+class PageHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(PAGE)))
+        self.end_headers()
+        if '/stall/' in self.path:
+            # Most of the page, then nothing until the client gives up
+            self.wfile.write(PAGE[:-20])
+            self.wfile.flush()
+            time.sleep(5)
+        else:
+            self.wfile.write(PAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+@unittest.skipUnless(shutil.which('curl'), "curl not installed")
+class TruncatedTransferTests(unittest.TestCase):
+    def setUp(self):
+        server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.base = f"http://127.0.0.1:{server.server_port}"
+
+        options = list(zepto_curl_enricher.CURL_OPTIONS)
+        options[options.index('--max-time') + 1] = '1'
+        patcher = mock.patch.object(zepto_curl_enricher, 'CURL_OPTIONS', options)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_cut_off_page_is_not_returned(self):
+        pages = zepto_curl_enricher.fetch_product_pages(
+            [f"{self.base}/ok/", f"{self.base}/stall/"], parallel=2, retries=1)
+        self.assertEqual(pages, [PAGE.decode(), None])
+
+    def test_cut_off_page_is_not_cached(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        products = [
+            {'name': 'Complete', 'pvid': 'a', 'url': f"{self.base}/ok/"},
+            {'name': 'Cut off', 'pvid': 'b', 'url': f"{self.base}/stall/"},
+        ]
+        fetch_once = functools.partial(zepto_curl_enricher.fetch_product_pages, retries=1)
+        with mock.patch.object(zepto_curl_enricher, 'fetch_product_pages', fetch_once), \
+                mock.patch('builtins.print'):
+            results = zepto_curl_enricher.batch_enrich(products, tmp.name, rps=100, workers=2)
+        self.assertTrue(results[0]['has_nutrition'])
+        self.assertEqual(results[1]['error'], 'fetch_failed')
+
+        cache = zepto_curl_enricher.open_page_cache(Path(tmp.name))
+        self.addCleanup(cache.close)
+        self.assertEqual([pvid for pvid, in cache.execute("SELECT pvid FROM results")], ['a'])
+
+
+if __name__ == "__main__":
+    unittest.main()
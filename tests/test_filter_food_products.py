@@ -0,0 +1,35 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "scrapers"))
+
+import filter_food_products
+from filter_food_products import build_keyword_matcher
+
+
+class KeywordMatcherTests(unittest.TestCase):
+    def check_backends(self, keywords, text, expected):
+        backends = {'regex': None}
+        if filter_food_products.ahocorasick is not None:
+            backends['ahocorasick'] = filter_food_products.ahocorasick
+        for name, module in backends.items():
+            with self.subTest(backend=name), mock.patch.object(filter_food_products, 'ahocorasick', module):
+                self.assertIs(build_keyword_matcher(keywords)(text), expected)
+
+    def test_no_keywords_match_nothing(self):
+        self.check_backends([], 'paneer tikka', False)
+        self.check_backends(set(), '', False)
+
+    def test_empty_keyword_matches_everything(self):
+        self.check_backends([''], 'paneer tikka', True)
+        self.check_backends(['', 'tea'], '', True)
+
+    def test_keywords(self):
+        self.check_backends(['tea', 'teff'], 'green tea bags', True)
+        self.check_backends(['tea', 'teff'], 'coffee', False)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import importlib.util
+import json
+import multiprocessing
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+API_MAIN = Path(__file__).parent.parent / "api" / "main.py"
+
+
+def make_api_tree(root: Path) -> Path:
+    """Copy api/main.py under root, with an empty catalog in root/data/zepto"""
+    data_dir = root / "data" / "zepto"
+    data_dir.mkdir(parents=True)
+    (data_dir / "products_food.json").write_text(json.dumps({"products": []}))
+    (data_dir / "categories.json").write_text(json.dumps({"categories": []}))
+    (data_dir / "brands.json").write_text(json.dumps({"brands": []}))
+    (root / "api").mkdir()
+    shutil.copy(API_MAIN, root / "api" / "main.py")
+    return root / "api" / "main.py"
+
+
+def import_api(main_path: Path):
+    spec = importlib.util.spec_from_file_location("food_api_main", main_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_api(root: Path):
+    """Import a copy of api/main.py that reads its data from root/data/zepto"""
+    return import_api(make_api_tree(root))
+
+
+class PriceSearchTests(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.client = TestClient(load_api(Path(tmp.name)).app)
+        response = self.client.post("/prices/ingest", json={
+            "products": [
+                {"name": "CAFÉ Filter Coffee", "variant_id": "a", "mrp": 250, "selling_price": 240},
+                {"name": "Masala Chai 100% Assam", "variant_id": "b", "mrp": 120, "selling_price": 99},
+            ],
+            "source": "Zepto",
+        })
+        self.assertEqual(response.status_code, 200)
+
+    def search(self, **params):
+        return [r['name'] for r in self.client.get("/prices", params=params).json()['results']]
+
+    def test_non_ascii_name_is_case_insensitive(self):
+        self.assertEqual(self.search(q="café"), ["CAFÉ Filter Coffee"])
+        self.assertEqual(self.search(q="CAFÉ"), ["CAFÉ Filter Coffee"])
+
+    def test_query_is_matched_literally(self):
+        self.assertEqual(self.search(q="100%"), ["Masala Chai 100% Assam"])
+        self.assertEqual(self.search(q="_"), [])
+
+    def test_source_is_case_insensitive(self):
+        self.assertEqual(len(self.search(source="zepto")), 2)
+        self.assertEqual(self.search(source="blinkit"), [])
+
+
+def _start_worker(main_path):
+    import_api(Path(main_path))
+
+
+class PriceDatabaseStartupTests(unittest.TestCase):
+    def test_concurrent_worker_starts_import_legacy_prices_once(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        main_path = make_api_tree(root)
+        history = [{"mrp": 100, "selling_price": 90, "timestamp": f"2026-01-0{d}"} for d in range(1, 4)]
+        (root / "data" / "zepto" / "prices.json").write_text(json.dumps({
+            f"zepto:{i}": {"name": f"Product {i}", "source": "zepto", "price_history": history}
+            for i in range(200)
+        }))
+
+        ctx = multiprocessing.get_context("spawn")
+        workers = [ctx.Process(target=_start_worker, args=(str(main_path),)) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual([worker.exitcode for worker in workers], [0] * 4)
+
+        conn = sqlite3.connect(root / "data" / "zepto" / "prices.sqlite")
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM tracked_products").fetchone()[0], 200)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM price_points").fetchone()[0], 600)
+
+    def test_restart_replaces_eviction_trigger_only_when_limit_changes(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        main_path = make_api_tree(root)
+        db_file = root / "data" / "zepto" / "prices.sqlite"
+
+        def schema_version():
+            conn = sqlite3.connect(db_file)
+            try:
+                return conn.execute("PRAGMA schema_version").fetchone()[0]
+            finally:
+                conn.close()
+
+        import_api(main_path)
+        version = schema_version()
+        import_api(main_path)
+        self.assertEqual(schema_version(), version)
+
+        main_path.write_text(main_path.read_text().replace("PRICE_HISTORY_LIMIT = 100", "PRICE_HISTORY_LIMIT = 3"))
+        client = TestClient(import_api(main_path).app)
+        for mrp in range(6):
+            client.post("/prices/ingest", json={"products": [{"name": "Ghee", "variant_id": "g", "mrp": mrp}], "source": "zepto"})
+        history = client.get("/prices/zepto:g").json()['price_history']
+        self.assertEqual([h['mrp'] for h in history], [3, 4, 5])
+
+
+if __name__ == "__main__":
+    unittest.main()